@@ -1,35 +1,46 @@
+import sys
 from pathlib import Path
 
 from matplotlib import pyplot as plt
 from sklearn.datasets import load_diabetes
-from sklearn.preprocessing import StandardScaler
 from sortedl1 import Slope
 
-x, y = load_diabetes(return_X_y=True)
-scaler = StandardScaler()
-x = scaler.fit_transform(x)
+sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-model_lasso = Slope(lambda_type="lasso")
-model_slope = Slope(lambda_type="bh", q=0.4)
+from slopeutils import cached_dataset, cross_validate
 
-fit_lasso = model_lasso.path(x, y)
-fit_slope = model_slope.path(x, y)
 
-plt.rcParams["savefig.bbox"] = "tight"
-Path("images").mkdir(parents=True, exist_ok=True)
+def main():
+    # Standardized once into the dataset store, then memory-mapped
+    diabetes = cached_dataset("diabetes", lambda: load_diabetes(return_X_y=True))
+    x, y = diabetes.X, diabetes.y
 
-figsize = (2.8, 2.5)
+    model_lasso = Slope(lambda_type="lasso")
+    model_slope = Slope(lambda_type="bh", q=0.4)
 
-fit_lasso.plot(figsize=figsize)
-plt.title("Lasso")
-plt.savefig("images/diabetes-slope-python.pdf")
+    fit_lasso = model_lasso.path(x, y)
+    fit_slope = model_slope.path(x, y)
 
-fit_slope.plot(figsize=figsize)
-plt.title("SLOPE")
-plt.savefig("images/diabetes-lasso-python.pdf")
+    plt.rcParams["savefig.bbox"] = "tight"
+    Path("images").mkdir(parents=True, exist_ok=True)
 
-fit_cv = model_slope.cv(x, y, q=[0.1, 0.2])
+    figsize = (2.8, 2.5)
 
-fit_cv.plot()
+    fit_lasso.plot(figsize=figsize)
+    plt.title("Lasso")
+    plt.savefig("images/diabetes-slope-python.pdf")
 
-plt.savefig("images/slope-cv-python.pdf")
+    fit_slope.plot(figsize=figsize)
+    plt.title("SLOPE")
+    plt.savefig("images/diabetes-lasso-python.pdf")
+
+    # Folds and q values are fit in parallel processes
+    fit_cv = cross_validate(x, y, model_slope, q=[0.1, 0.2])
+
+    fit_cv.plot()
+
+    plt.savefig("images/slope-cv-python.pdf")
+
+
+if __name__ == "__main__":
+    main()
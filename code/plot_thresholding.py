@@ -1,5 +1,4 @@
 import sys
-from bisect import bisect_left
 from pathlib import Path
 
 import matplotlib.pyplot as plt
@@ -8,26 +7,15 @@ from scipy import stats
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from slopeutils import FULL_WIDTH, set_plot_defaults
-
-
-def dual_norm_slope(X, theta, alphas):
-    """Dual slope norm of X.T @ theta"""
-    Xtheta = np.sort(np.abs(X.T @ theta))[::-1]
-    taus = 1 / np.cumsum(alphas)
-    return np.max(np.cumsum(Xtheta) * taus)
-
-
-def get_clusters(w):
-    unique, indices, counts = np.unique(
-        np.abs(w), return_inverse=True, return_counts=True
-    )
-
-    clusters = [[] for _ in range(len(unique))]
-    for i in range(len(indices)):
-        clusters[indices[i]].append(i)
-    return clusters[::-1], counts[::-1], indices[::-1], unique[::-1]
-
+from slopeutils import (
+    FULL_WIDTH,
+    cluster_threshold,
+    dual_norm_slope,
+    get_clusters,
+    set_plot_defaults,
+    stage,
+    threshold_breakpoints,
+)
 
 set_plot_defaults()
 
@@ -51,11 +39,8 @@ lambdas = lambda_max * lambdas * 0.5
 
 beta = np.array([0.5, -0.5, 0.3, 0.7])
 
-C, C_size, c_indices, c = get_clusters(beta)
-C = np.asarray(C, dtype="object")
-C_size = np.array(C_size)
-C_start = np.concatenate(([0], np.cumsum(list(map(len, np.delete(C, -1))))))
-C_end = C_start + C_size
+clusters = get_clusters(beta)
+c = clusters.values
 
 s = np.sign(beta)
 
@@ -65,61 +50,12 @@ c_vals = np.sort(np.concatenate((c, -c, [0], c_vals)))
 
 i = 1
 
-l_sums = []
-r_sums = []
-sums = []
-
-for j in range(len(C)):
-    if j == i:
-        continue
-
-    mod = len(C[i]) if j > i else 0
-
-    # check upper end of cluster
-    l_start = C_start[j] - mod
-    l_end = C_start[j] + len(C[i]) - mod
-
-    # check lower end of cluster
-    r_start = C_end[j] - mod
-    r_end = C_end[j] + len(C[i]) - mod
+l_sums, r_sums, sums = threshold_breakpoints(clusters, lambdas, i)
 
-    l_sum = sum(lambdas[l_start:l_end])
-    r_sum = sum(lambdas[r_start:r_end])
-
-    l_sums.extend([l_sum + c[j]])
-    r_sums.extend([r_sum + c[j]])
-
-    sums.extend([l_sum, r_sum])
-
-l_sums = np.array(l_sums)
-r_sums = np.array(r_sums)
-
-sums = np.sort(np.unique(sums))[::-1]
-
-c_wo_i = np.delete(c, i)
 a_list = np.sort(np.hstack((sums, l_sums, r_sums, np.linspace(0, 2, 100))))
 a_list = np.sort(np.hstack((-a_list, a_list)))
-res = []
-
-zerosum = np.sum(lambdas[::-1][range(2)])
-
-for a in a_list:
-    k = np.where(np.logical_and(np.sign(a) * a <= l_sums, np.sign(a) * a >= r_sums))[0]
-
-    if np.abs(a) < zerosum:
-        res.extend([0.0])
-    elif len(k) != 0:
-        l_sum = l_sums[k][0]
-        r_sum = r_sums[k][0]
-
-        res.extend([float(np.sign(a) * c_wo_i[k][0])])
-    else:
-        ll = len(l_sums) - bisect_left(l_sums[::-1], np.abs(a))
-        res.extend([np.sign(a) * (np.abs(a) - sums[ll])])
-
-res = np.asarray(res, dtype=float)
 
-plt.rcParams["text.usetex"] = True
+res = cluster_threshold(a_list, clusters, lambdas, i)
 
 fig, ax = plt.subplots(figsize=(FULL_WIDTH, 2.3), constrained_layout=True)
 
@@ -144,8 +80,8 @@ xy = np.stack(
 )
 
 ax.plot(a_list, res, "-", color="black")
-ax.set_ylabel(r"\(T(\gamma, \omega; c, \lambda)\)")
-ax.set_xlabel(r"\(\gamma\)")
+ax.set_ylabel(r"$T(\gamma, \omega; c, \lambda)$")
+ax.set_xlabel(r"$\gamma$")
 
 y2_labs = (
     r"$-c^{\setminus k}_1$",
@@ -159,6 +95,7 @@ y2_vals = np.sort(np.hstack((-np.delete(c, 1), np.delete(c, 1))))
 if savefig:
     figpath = "images/slope-thresholding.pdf"
     Path(figpath).parent.mkdir(parents=True, exist_ok=True)
-    fig.savefig(figpath, bbox_inches="tight", pad_inches=0.05)
+    with stage("savefig", path=figpath):
+        fig.savefig(figpath, bbox_inches="tight", pad_inches=0.05)
 else:
     plt.show(block=False)
@@ -1,17 +1,115 @@
-from .merge_parquet import merge_parquet_files
+from .aggregate import (
+    performance_profile,
+    performance_ratios,
+    repetition_bands,
+    time_to_tolerance,
+)
+from .cache import ResultsLoad, load_cached_results, warm_cache
+from .compress import compress_results, compress_traces, trace_mask
+from .cv import cross_validate, cv_table
+from .datasets import (
+    Dataset,
+    cached_dataset,
+    load_dataset,
+    load_design,
+    read_csv_design,
+    share_design,
+    store_dataset,
+)
+from .facets import facet_groups, facet_limits, plot_facets, solver_styles
+from .merge_parquet import (
+    LoadReport,
+    compact_table,
+    contains,
+    load_results,
+    merge_parquet_files,
+)
+from .params import (
+    extract_params,
+    map_unique,
+    param_table,
+    parse_param_column,
+    parse_params,
+)
+from .path import SlopePath, lambda_sequence, slope_path, strong_set
 from .plot_utils import (
     FULL_WIDTH,
+    PATH_RESULTS,
+    SINGLE_REAL_RESULTS,
+    SINGLE_SIMULATED_RESULTS,
+    extract_path_length,
     extract_reg_param,
     legend_labels,
     reg_labels,
     set_plot_defaults,
 )
+from .profiling import profiled, stage, write_report
+from .prox import prox_slope, prox_slope_batch
+from .query import ResultQuery, scan_results
+from .simulate import simulate_dataset, simulate_design
+from .slope import Clusters, dual_norm_slope, dual_norm_slope_batch, get_clusters
+from .thresholding import cluster_threshold, threshold_breakpoints
 
 __all__ = [
     "merge_parquet_files",
+    "load_results",
+    "contains",
+    "LoadReport",
+    "load_cached_results",
+    "ResultsLoad",
+    "warm_cache",
     "set_plot_defaults",
     "FULL_WIDTH",
+    "SINGLE_REAL_RESULTS",
+    "SINGLE_SIMULATED_RESULTS",
+    "PATH_RESULTS",
     "legend_labels",
     "reg_labels",
     "extract_reg_param",
+    "extract_path_length",
+    "parse_params",
+    "param_table",
+    "parse_param_column",
+    "extract_params",
+    "map_unique",
+    "facet_groups",
+    "facet_limits",
+    "plot_facets",
+    "solver_styles",
+    "time_to_tolerance",
+    "performance_ratios",
+    "performance_profile",
+    "ResultQuery",
+    "scan_results",
+    "dual_norm_slope",
+    "dual_norm_slope_batch",
+    "Clusters",
+    "get_clusters",
+    "cluster_threshold",
+    "threshold_breakpoints",
+    "prox_slope",
+    "prox_slope_batch",
+    "slope_path",
+    "SlopePath",
+    "lambda_sequence",
+    "strong_set",
+    "cross_validate",
+    "cv_table",
+    "share_design",
+    "load_design",
+    "Dataset",
+    "store_dataset",
+    "load_dataset",
+    "cached_dataset",
+    "read_csv_design",
+    "simulate_design",
+    "simulate_dataset",
+    "trace_mask",
+    "compress_traces",
+    "compress_results",
+    "stage",
+    "profiled",
+    "write_report",
+    "repetition_bands",
+    "compact_table",
 ]
@@ -0,0 +1,436 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+
+from .merge_parquet import find_parquet_files, results_dataset
+from .profiling import profiled
+
+CELL_KEYS = ["solver_name", "data_name", "objective_name", "idx_rep"]
+PROBLEM_KEYS = ["data_name", "objective_name", "idx_rep", "tolerance"]
+
+
+def iter_result_batches(
+    directory_path: str,
+    columns: list[str],
+    filters: pc.Expression | None = None,
+    batch_size: int = 65536,
+):
+    """
+    Stream the rows of a results directory as pandas DataFrames.
+
+    Only `columns` are decoded, `filters` is evaluated by the scanner and at
+    most `batch_size` rows are held in memory at a time. Files whose schemas
+    drifted are read with a unified schema, as in `load_results`.
+    """
+    files = find_parquet_files(directory_path)
+
+    if not files:
+        return
+
+    dataset = results_dataset(files)
+    scanner = dataset.scanner(columns=columns, filter=filters, batch_size=batch_size)
+
+    for batch in scanner.to_batches():
+        if batch.num_rows > 0:
+            yield batch.to_pandas()
+
+
+@profiled()
+def time_to_tolerance(
+    directory_path: str,
+    tolerances: Sequence[float] = (1e-2, 1e-4, 1e-6),
+    gap: str = "objective_duality_gap",
+    scale: str | None = "objective_value",
+    keys: list[str] = CELL_KEYS,
+    filters: pc.Expression | None = None,
+    batch_size: int = 65536,
+) -> pd.DataFrame:
+    """
+    Time at which each run first reaches a given duality gap.
+
+    The results are streamed in batches and reduced incrementally, keeping
+    only the running minimum time per run and tolerance, so memory depends
+    on the number of runs and not on the number of rows.
+
+    Parameters:
+    -----------
+    directory_path : str
+        Path to the directory containing parquet files
+    tolerances : sequence of float
+        Gap values to reach
+    gap : str
+        Column with the duality gap
+    scale : str, optional
+        Column the gap is divided by, giving the relative gap with the
+        default. The gap is used as is if None.
+    keys : list of str
+        Columns identifying a run
+    filters : pyarrow.compute.Expression, optional
+        Row predicate pushed down to the parquet reader
+    batch_size : int
+        Maximum number of rows per batch
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per run and tolerance with the `time` to reach the
+        tolerance, which is infinite for runs that never reached it
+    """
+    keys = list(keys)
+    columns = keys + ["time", gap] + ([scale] if scale is not None else [])
+
+    reached = None
+    runs = None
+
+    for batch in iter_result_batches(directory_path, columns, filters, batch_size):
+        values = batch[gap] / batch[scale] if scale is not None else batch[gap]
+
+        partial = []
+        for tolerance in tolerances:
+            hits = batch.loc[values <= tolerance, keys + ["time"]]
+            partial.append(
+                hits.groupby(keys, observed=True)["time"]
+                .min()
+                .reset_index()
+                .assign(tolerance=tolerance)
+            )
+        batch_runs = batch[keys].drop_duplicates()
+
+        reached = _reduce_min(partial if reached is None else [reached] + partial, keys)
+        runs = batch_runs if runs is None else pd.concat([runs, batch_runs])
+        runs = runs.drop_duplicates()
+
+    if runs is None:
+        return pd.DataFrame(columns=keys + ["tolerance", "time"])
+
+    grid = runs.merge(pd.DataFrame({"tolerance": list(tolerances)}), how="cross")
+    result = grid.merge(reached, on=keys + ["tolerance"], how="left")
+    result["time"] = result["time"].fillna(np.inf)
+
+    return result.sort_values(keys + ["tolerance"], ignore_index=True)
+
+
+def _reduce_min(frames: list[pd.DataFrame], keys: list[str]) -> pd.DataFrame:
+    return (
+        pd.concat(frames, ignore_index=True)
+        .groupby(keys + ["tolerance"], observed=True)["time"]
+        .min()
+        .reset_index()
+    )
+
+
+def performance_ratios(
+    ttt: pd.DataFrame,
+    solver: str = "solver_name",
+    problem_keys: list[str] = PROBLEM_KEYS,
+) -> pd.DataFrame:
+    """
+    Ratio of each solver's time to tolerance to the best solver's.
+
+    A problem is a combination of `problem_keys`, by default a dataset,
+    objective, repetition and tolerance. Problems that no solver solved are
+    dropped and solvers that failed a problem get an infinite ratio.
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Ratios with problems as rows and solvers as columns
+    """
+    times = ttt.pivot_table(
+        index=list(problem_keys),
+        columns=solver,
+        values="time",
+        aggfunc="min",
+        observed=True,
+    )
+    best = times.min(axis=1)
+    times = times[np.isfinite(best)]
+
+    return times.div(best[np.isfinite(best)], axis=0).fillna(np.inf)
+
+
+def performance_profile(
+    ttt: pd.DataFrame,
+    taus: np.ndarray | None = None,
+    solver: str = "solver_name",
+    problem_keys: list[str] = PROBLEM_KEYS,
+) -> pd.DataFrame:
+    """
+    Dolan–Moré performance profiles from times to tolerance.
+
+    The profile of a solver at `tau` is the fraction of problems it solves
+    within a factor `tau` of the fastest solver.
+
+    Parameters:
+    -----------
+    ttt : pandas.DataFrame
+        Output of `time_to_tolerance`
+    taus : numpy.ndarray, optional
+        Performance ratios to evaluate the profiles at. Defaults to a
+        logarithmic grid spanning the observed ratios.
+    solver : str
+        Column identifying the solvers
+    problem_keys : list of str
+        Columns identifying a problem
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Profiles with `taus` as index and solvers as columns
+    """
+    ratios = performance_ratios(ttt, solver, problem_keys)
+    values = ratios.to_numpy()
+
+    if taus is None:
+        finite = values[np.isfinite(values)]
+        upper = max(finite.max(), 1.0) if finite.size else 1.0
+        taus = np.geomspace(1.0, upper * 1.1, 100)
+
+    taus = np.asarray(taus, dtype=float)
+    profile = (values[:, :, None] <= taus[None, None, :]).mean(axis=0)
+
+    return pd.DataFrame(
+        profile.T, index=pd.Index(taus, name="tau"), columns=ratios.columns
+    )
+
+
+def _nan_quantiles(values: np.ndarray, qs: list[float], axis: int) -> list:
+    """Quantiles along an axis, ignoring NaN, with a single sort."""
+    values = np.sort(values, axis=axis)
+    count = np.sum(~np.isnan(values), axis=axis, keepdims=True)
+
+    results = []
+    for q in qs:
+        position = q * (count - 1)
+        below = np.clip(np.floor(position), 0, None).astype(np.intp)
+        above = np.clip(np.ceil(position), 0, None).astype(np.intp)
+        low = np.take_along_axis(values, below, axis=axis)
+        high = np.take_along_axis(values, above, axis=axis)
+
+        with np.errstate(invalid="ignore"):
+            value = np.where(high == low, low, low + (high - low) * (position - below))
+
+        results.append(np.squeeze(np.where(count > 0, value, np.nan), axis=axis))
+
+    return results
+
+
+def align_repetitions(
+    df: pd.DataFrame,
+    keys: list[str],
+    rep: str = "idx_rep",
+    x: str = "time",
+    y: str = "rel_gap",
+    n_grid: int = 100,
+    along: str = "time",
+) -> tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Align the repetitions of each cell onto a common grid.
+
+    With `along="time"`, the grid spans the times of all repetitions of a
+    cell, and each trace is interpolated linearly in log `y`. Outside its
+    own time range a trace keeps its first or last value. With
+    `along="tolerance"`, the grid spans the `y` values of the cell on a log
+    scale, and each trace gives the first time its running minimum reaches
+    each value, which is infinite if it never does.
+
+    All traces are interpolated in one call: each is mapped to its own unit
+    interval, offset by its index, so that the concatenation is sorted.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Convergence traces
+    keys : list of str
+        Columns identifying a cell, whose repetitions are aligned
+    rep : str
+        Column identifying the repetition within a cell
+    x, y : str
+        Time and convergence measure columns
+    n_grid : int
+        Number of grid points
+    along : str
+        Grid to align on, "time" or "tolerance"
+
+    Returns:
+    --------
+    tuple of (pandas.DataFrame, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        The cells, their grids of shape `(n_cells, n_grid)`, the number of
+        repetitions of each cell, and the aligned values, of shape
+        `(n_cells, max_reps, n_grid)` and padded with NaN. The values are
+        `log10(y)` along time and times along tolerance.
+    """
+    if along not in ("time", "tolerance"):
+        raise ValueError(f"along must be 'time' or 'tolerance', not {along!r}")
+
+    keys = list(keys)
+    df = df.sort_values(keys + [rep, x], kind="stable", ignore_index=True)
+
+    trace = df.groupby(keys + [rep], sort=False, observed=True, dropna=False)
+    trace = trace.ngroup().to_numpy()
+    n = len(trace)
+
+    starts = np.flatnonzero(np.r_[True, trace[1:] != trace[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    n_traces = len(starts)
+
+    cell = df.groupby(keys, sort=False, observed=True, dropna=False).ngroup()
+    cell = cell.to_numpy()
+    trace_cell = cell[starts]
+    first_trace = np.flatnonzero(np.r_[True, trace_cell[1:] != trace_cell[:-1]])
+    n_reps = np.diff(np.r_[first_trace, n_traces])
+    rep_position = np.arange(n_traces) - np.repeat(first_trace, n_reps)
+    cell_starts = starts[first_trace]
+
+    x_values = df[x].to_numpy(dtype=float)
+    log_y = np.log10(np.maximum(df[y].to_numpy(dtype=float), np.finfo(float).tiny))
+
+    unit = np.linspace(0.0, 1.0, n_grid)
+    queries = (3.0 * np.arange(n_traces)[:, None] + unit).ravel()
+
+    if along == "time":
+        low = np.minimum.reduceat(x_values, cell_starts)
+        span = np.maximum.reduceat(x_values, cell_starts) - low
+        span[span == 0] = 1.0
+
+        u = (x_values - low[cell]) / span[cell]
+        values = np.interp(queries, 3.0 * trace + u, log_y).reshape(n_traces, n_grid)
+        values = np.where(unit < u[starts, None], log_y[starts, None], values)
+        values = np.where(unit > u[ends, None], log_y[ends, None], values)
+
+        grid = low[:, None] + unit * span[:, None]
+    else:
+        high = np.maximum.reduceat(log_y, cell_starts)
+        span = high - np.minimum.reduceat(log_y, cell_starts)
+        span[span == 0] = 1.0
+
+        envelope = pd.Series(log_y).groupby(trace).cummin().to_numpy()
+        v = (high[cell] - envelope) / span[cell]
+        first_hit = np.searchsorted(3.0 * trace + v, queries, side="left")
+        first_hit = first_hit.reshape(n_traces, n_grid)
+
+        reached = first_hit <= ends[:, None]
+        values = np.where(reached, x_values[np.minimum(first_hit, n - 1)], np.inf)
+
+        grid = 10 ** (high[:, None] - unit * span[:, None])
+
+    aligned = np.full((len(first_trace), n_reps.max(), n_grid), np.nan)
+    aligned[trace_cell, rep_position] = values
+
+    cells = df.loc[cell_starts, keys].reset_index(drop=True)
+
+    return cells, grid, n_reps, aligned
+
+
+@profiled()
+def repetition_bands(
+    df: pd.DataFrame,
+    keys: list[str],
+    rep: str = "idx_rep",
+    x: str = "time",
+    y: str = "rel_gap",
+    n_grid: int = 100,
+    along: str = "time",
+    n_boot: int = 1000,
+    level: float = 0.9,
+    seed: int = 0,
+    max_elements: int = 2**24,
+) -> pd.DataFrame:
+    """
+    Median traces across repetitions with bootstrap confidence bands.
+
+    The repetitions of every cell are aligned with `align_repetitions`.
+    At each grid point, the median over repetitions is computed together
+    with a percentile bootstrap interval of that median.
+
+    The median of a resample only depends on which order statistics of
+    the original values it draws. The `n_boot` resamples are therefore
+    drawn once, as ranks, for each number of repetitions. Their medians at
+    every cell and grid point are then gathered from the sorted values of
+    that cell, in chunks of cells holding at most `max_elements` values.
+    This gives the same distribution as resampling the repetitions of each
+    cell, at the cost of a sort per cell, whatever `n_boot` is.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Convergence traces
+    keys : list of str
+        Columns identifying a cell, e.g. `["dataset", "reg", "solver_name"]`
+    rep : str
+        Column identifying the repetition within a cell
+    x, y : str
+        Time and convergence measure columns
+    n_grid : int
+        Number of grid points per cell
+    along : str
+        Grid to align on, "time" for bands of `y` over time, or
+        "tolerance" for bands of the time to reach each value of `y`
+    n_boot : int
+        Number of bootstrap samples
+    level : float
+        Confidence level of the bands
+    seed : int
+        Seed of the bootstrap
+    max_elements : int
+        Size of the largest array of bootstrap medians held in memory
+
+    Returns:
+    --------
+    pandas.DataFrame
+        For each cell and grid point, the `x` and `y` columns, one of which
+        is the grid and the other the median, the `lower` and `upper`
+        bounds of the band of the median and the number of repetitions
+        `n_reps`. It can be drawn with `plot_facets(...,
+        bands=("lower", "upper"))`, with `band_axis="x"` along tolerance.
+    """
+    cells, grid, n_reps, aligned = align_repetitions(df, keys, rep, x, y, n_grid, along)
+    alpha = (1 - level) / 2
+
+    (median,) = _nan_quantiles(aligned, [0.5], axis=1)
+    lower = np.empty_like(median)
+    upper = np.empty_like(median)
+
+    rng = np.random.default_rng(seed)
+
+    for n in np.unique(n_reps):
+        group = np.flatnonzero(n_reps == n)
+
+        # Ranks of the middle order statistics of resamples of n values
+        draws = np.sort(rng.integers(0, n, (n_boot, n)), axis=1)
+        pairs, counts = np.unique(
+            draws[:, [(n - 1) // 2, n // 2]], axis=0, return_counts=True
+        )
+        weights = counts / n_boot
+        chunk = max(1, max_elements // (len(pairs) * n_grid))
+
+        for start in range(0, len(group), chunk):
+            cells_chunk = group[start : start + chunk]
+            ordered = np.sort(aligned[cells_chunk, :n], axis=1)
+
+            # The median of each distinct resample, and how often it occurs
+            medians = (ordered[:, pairs[:, 0]] + ordered[:, pairs[:, 1]]) / 2
+            order = np.argsort(medians, axis=1)
+            cumulative = np.cumsum(weights[order], axis=1)
+
+            for bound, q in ((lower, alpha), (upper, 1 - alpha)):
+                index = np.argmax(cumulative >= q - 1e-12, axis=1)[:, None]
+                rank = np.take_along_axis(order, index, axis=1)
+                bound[cells_chunk] = np.take_along_axis(medians, rank, axis=1)[:, 0]
+
+    if along == "time":
+        median, lower, upper = 10**median, 10**lower, 10**upper
+        columns = {x: grid.ravel(), y: median.ravel()}
+    else:
+        columns = {x: median.ravel(), y: grid.ravel()}
+
+    result = cells.loc[cells.index.repeat(n_grid)].reset_index(drop=True)
+
+    return result.assign(
+        **columns,
+        lower=lower.ravel(),
+        upper=upper.ravel(),
+        n_reps=np.repeat(n_reps, n_grid),
+    )
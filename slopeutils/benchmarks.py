@@ -0,0 +1,424 @@
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .aggregate import time_to_tolerance
+from .cache import default_cache_dir, load_cached_results
+from .facets import facet_groups, facet_limits, plot_facets
+from .merge_parquet import load_results
+from .params import map_unique, parse_params
+from .plot_utils import extract_reg_param
+from .profiling import current_rss, reset_peak_rss
+
+# (rows, files) of the result sets benchmarked by default
+SCALES = [(10_000, 1), (100_000, 10), (1_000_000, 100), (10_000_000, 500)]
+
+TRACE_LENGTH = 50
+
+OBJECTIVES = [f"SLOPE[fit_intercept=False,q=0.2,reg={reg}]" for reg in (0.5, 0.1, 0.02)]
+DATASETS = [
+    "Simulated[X_density=1.0,n_features=20000,n_samples=200,n_signals=20,rho=0.6]",
+    "Simulated[X_density=1.0,n_features=200,n_samples=200000,n_signals=40,rho=0.6]",
+    "breheny[dataset=brca1,standardize=True]",
+    "libsvm[dataset=rcv1.binary,standardize=True]",
+]
+SOLVERS = [
+    "PGD[acceleration=fista,prox=prox_fast_stack]",
+    "PGD[acceleration=bb,prox=prox_fast_stack]",
+    "PGD[acceleration=anderson,prox=prox_fast_stack]",
+    "ADMM[adaptive_rho=False,rho=100]",
+    "sortedl1[cd_type=permuted,update_clusters=True]",
+    "skglm",
+    "SlopePath",
+    "Newt-ALM[inner_solver=standard]",
+    "PGD_safe_screening[accelerated=True]",
+]
+
+COLUMNS = [
+    "objective_name",
+    "data_name",
+    "solver_name",
+    "idx_rep",
+    "stop_val",
+    "time",
+    "objective_value",
+    "objective_duality_gap",
+]
+
+
+def _synthetic_table(first_cell: int, n_rows: int, rng) -> pa.Table:
+    """Benchopt-shaped results for `n_rows` rows starting at cell `first_cell`."""
+    position = np.arange(n_rows)
+    cell = first_cell + position // TRACE_LENGTH
+    step = position % TRACE_LENGTH
+
+    solver = cell % len(SOLVERS)
+    objective = (cell // len(SOLVERS)) % len(OBJECTIVES)
+    dataset = (cell // (len(SOLVERS) * len(OBJECTIVES))) % len(DATASETS)
+    repetition = cell // (len(SOLVERS) * len(OBJECTIVES) * len(DATASETS))
+
+    speed = 1 + solver + dataset
+    objective_value = 1 + rng.random(n_rows)
+    rel_gap = 10.0 ** (-10 * step / TRACE_LENGTH) * (1 + 0.1 * rng.random(n_rows))
+
+    def strings(values, codes):
+        return pa.array(np.asarray(values, dtype=object)[codes], pa.string())
+
+    return pa.table(
+        {
+            "objective_name": strings(OBJECTIVES, objective),
+            "solver_name": strings(SOLVERS, solver),
+            "data_name": strings(DATASETS, dataset),
+            "idx_rep": repetition.astype(np.int64),
+            "sampling_strategy": pa.array(["Tolerance"] * n_rows),
+            "stop_val": (step + 1).astype(float),
+            "time": 0.01 * speed * (step + 1) * (1 + 0.05 * rng.random(n_rows)),
+            "objective_value": objective_value,
+            "objective_duality_gap": rel_gap * objective_value,
+            "objective_rel_duality_gap": rel_gap,
+            "platform": pa.array(["Linux"] * n_rows),
+        }
+    )
+
+
+def make_results(directory: str | Path, n_rows: int, n_files: int, seed: int = 0):
+    """
+    Write a synthetic benchopt results directory.
+
+    The rows form convergence traces of `TRACE_LENGTH` points for every
+    solver, objective, dataset and repetition, spread over `n_files` files
+    with the columns of real benchopt output. The set is reused if it
+    already exists.
+    """
+    directory = Path(directory)
+    marker = directory / ".complete"
+
+    if marker.exists():
+        return directory
+
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    bounds = np.linspace(0, n_rows // TRACE_LENGTH, n_files + 1).astype(int)
+    bounds[-1] = -(-n_rows // TRACE_LENGTH)
+
+    for i, (start, stop) in enumerate(itertools.pairwise(bounds)):
+        rows = min(stop * TRACE_LENGTH, n_rows) - start * TRACE_LENGTH
+        table = _synthetic_table(start, rows, rng)
+        pq.write_table(table, directory / f"benchopt_run_{i:04d}.parquet")
+
+    marker.touch()
+
+    return directory
+
+
+def _load(directory):
+    df, _ = load_results(directory, columns=COLUMNS)
+    return df
+
+
+def _parsed(directory):
+    df = extract_reg_param(_load(directory))
+    df["dataset"] = map_unique(df["data_name"], lambda name: parse_params(name)[0])
+    df["rel_gap"] = df["objective_duality_gap"] / df["objective_value"]
+    return df
+
+
+def _bench_load(directory):
+    return lambda: _load(directory)
+
+
+def _bench_load_cached(directory):
+    cache_dir = os.path.join(directory, ".cache")
+    load_cached_results(directory, columns=COLUMNS, cache_dir=cache_dir)
+    return lambda: load_cached_results(directory, columns=COLUMNS, cache_dir=cache_dir)
+
+
+def _bench_parse(directory):
+    df = _load(directory)
+
+    def run():
+        parsed = extract_reg_param(df)
+        parsed["dataset"] = map_unique(
+            parsed["data_name"], lambda name: parse_params(name)[0]
+        )
+
+    return run
+
+
+def _bench_aggregate(directory):
+    return lambda: time_to_tolerance(directory)
+
+
+def _bench_facets(directory):
+    df = _parsed(directory)
+
+    def run():
+        facet_groups(df, ["dataset", "reg", "solver_name"])
+        facet_limits(df, ["reg", "dataset"], hue="solver_name")
+
+    return run
+
+
+def _bench_figure(directory):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    df = _parsed(directory)
+
+    def run():
+        fig, _, _ = plot_facets(
+            df, row="dataset", col="reg", hue="solver_name", x="time", y="rel_gap"
+        )
+        fig.savefig(io.BytesIO(), format="png")
+        plt.close(fig)
+
+    return run
+
+
+# Each benchmark prepares its inputs from a results directory and returns
+# the function to time
+BENCHMARKS = {
+    "load": _bench_load,
+    "load_cached": _bench_load_cached,
+    "parse": _bench_parse,
+    "aggregate": _bench_aggregate,
+    "facets": _bench_facets,
+    "figure": _bench_figure,
+}
+
+
+def measure(func, repeat: int = 3) -> dict:
+    """
+    Time a function and measure its peak memory.
+
+    The time is the best of `repeat` runs. `peak_memory` is the peak of
+    allocations traced by `tracemalloc` during a separate run, which covers
+    NumPy and Python objects but not Arrow's memory pool. `peak_rss` is the
+    growth of the resident set size at its peak during another run, which
+    covers Arrow, and is None where it cannot be measured.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Memory the pool kept from earlier runs would hide the allocations
+    pa.default_memory_pool().release_unused()
+    start_rss = current_rss()
+    if reset_peak_rss() is None or start_rss is None:
+        peak_rss = None
+    else:
+        func()
+        peak_rss = max(reset_peak_rss() - start_rss, 0)
+
+    return {
+        "time": min(times),
+        "times": times,
+        "peak_memory": peak,
+        "peak_rss": peak_rss,
+    }
+
+
+def _git_revision() -> tuple[str, bool]:
+    # The revision of slopeutils, wherever the suite is run from
+    package_dir = Path(__file__).resolve().parent
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=package_dir,
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=package_dir,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+    return commit, dirty
+
+
+def run_benchmarks(
+    scales: list[tuple[int, int]] = SCALES,
+    benchmarks: list[str] | None = None,
+    repeat: int = 3,
+    data_dir: str | Path | None = None,
+) -> dict:
+    """
+    Run the benchmarks on synthetic result sets of each scale.
+
+    Parameters:
+    -----------
+    scales : list of (int, int)
+        Numbers of rows and files of the result sets
+    benchmarks : list of str, optional
+        Names of the benchmarks to run, all of `BENCHMARKS` by default
+    repeat : int
+        Number of timed runs of each benchmark
+    data_dir : str or Path, optional
+        Where the synthetic result sets are kept between runs, by default
+        `benchmarks` in the cache directory
+
+    Returns:
+    --------
+    dict
+        The commit, environment and one entry per benchmark and scale
+    """
+    data_dir = Path(data_dir) if data_dir else default_cache_dir() / "benchmarks"
+    commit, dirty = _git_revision()
+
+    results = []
+    for n_rows, n_files in scales:
+        directory = str(make_results(data_dir / f"{n_rows}x{n_files}", n_rows, n_files))
+
+        for name in benchmarks or BENCHMARKS:
+            result = measure(BENCHMARKS[name](directory), repeat)
+            results.append(
+                {"benchmark": name, "n_rows": n_rows, "n_files": n_files, **result}
+            )
+            rss = result["peak_rss"]
+            print(
+                f"{name:>12} {n_rows:>10} rows {n_files:>4} files "
+                f"{result['time']:9.4f} s {result['peak_memory'] / 2**20:9.1f} MiB"
+                + (f" {rss / 2**20:9.1f} MiB RSS" if rss is not None else "")
+            )
+
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(base: dict, new: dict, threshold: float = 1.2) -> list[dict]:
+    """
+    Compare two benchmark runs.
+
+    Returns one entry per benchmark and scale present in both runs, with
+    the ratios of the new time and memory to the base ones, flagged as a
+    regression when either ratio exceeds `threshold`. The memory ratio is
+    the larger of the traced and resident memory ratios, when both runs
+    measured the latter.
+    """
+    base_results = {
+        (r["benchmark"], r["n_rows"], r["n_files"]): r for r in base["results"]
+    }
+
+    rows = []
+    for r in new["results"]:
+        key = (r["benchmark"], r["n_rows"], r["n_files"])
+        if key not in base_results:
+            continue
+
+        old = base_results[key]
+        time_ratio = r["time"] / old["time"]
+        memory_ratio = r["peak_memory"] / max(old["peak_memory"], 1)
+        if r.get("peak_rss") is not None and old.get("peak_rss") is not None:
+            memory_ratio = max(memory_ratio, r["peak_rss"] / max(old["peak_rss"], 1))
+        rows.append(
+            {
+                "benchmark": key[0],
+                "n_rows": key[1],
+                "n_files": key[2],
+                "time_ratio": time_ratio,
+                "memory_ratio": memory_ratio,
+                "regression": max(time_ratio, memory_ratio) > threshold,
+            }
+        )
+
+    return rows
+
+
+def _parse_scale(value: str) -> tuple[int, int]:
+    rows, _, files = value.partition("x")
+    return int(float(rows)), int(files or 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for slopeutils.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument(
+        "--scales",
+        nargs="+",
+        type=_parse_scale,
+        default=SCALES,
+        help="result sets as ROWSxFILES, e.g. 1e5x10",
+    )
+    run.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--data-dir", default=None)
+    run.add_argument("--output-dir", default=".benchmarks")
+
+    cmp = commands.add_parser("compare", help="compare two benchmark runs")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=1.2)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run_benchmarks(
+            args.scales, args.benchmarks, args.repeat, args.data_dir
+        )
+        os.makedirs(args.output_dir, exist_ok=True)
+        name = report["commit"] + ("-dirty" if report["dirty"] else "")
+        path = os.path.join(args.output_dir, f"{name}.json")
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {path}")
+        return 0
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows = compare(base, new, args.threshold)
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['benchmark']:>12} {row['n_rows']:>10} rows {row['n_files']:>4} "
+            f"files  time x{row['time_ratio']:.2f}  "
+            f"memory x{row['memory_ratio']:.2f}{flag}"
+        )
+
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
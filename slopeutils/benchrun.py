@@ -0,0 +1,260 @@
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+@dataclass(frozen=True)
+class BenchCell:
+    """
+    A single (objective, dataset, solver, repetition) run of a config.
+
+    `seed` is the base seed of the config, from which every repetition
+    derives its own `run_seed`.
+    """
+
+    objective: str
+    dataset: str
+    solver: str
+    repetition: int = 0
+    seed: int = 0
+
+    @property
+    def run_seed(self) -> int:
+        """Seed of this repetition, passed to `benchopt run --seed`."""
+        text = f"{self.seed}\n{self.repetition}"
+        return int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "little")
+
+    @property
+    def key(self) -> str:
+        """Stable identifier of the cell, used to name its shard."""
+        text = "\n".join(
+            [
+                self.objective,
+                self.dataset,
+                self.solver,
+                str(self.repetition),
+                str(self.run_seed),
+            ]
+        )
+        return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+    @property
+    def shard_name(self) -> str:
+        return f"cell_{self.key}.parquet"
+
+
+@dataclass
+class RunReport:
+    """Summary of a `run_config` call: cells run, skipped and failed."""
+
+    done: list[BenchCell] = field(default_factory=list)
+    skipped: list[BenchCell] = field(default_factory=list)
+    errors: dict[BenchCell, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def expand_config(config_path: str) -> list[BenchCell]:
+    """
+    Expand a benchopt config file into its cells.
+
+    Every objective, dataset and solver is combined, and each combination
+    is repeated `n-repetitions` times, with the base seed `seed` of the
+    config, 0 by default.
+    """
+    # PyYAML ships with benchopt, which the driver needs anyway
+    import yaml
+
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+
+    n_repetitions = int(config.get("n-repetitions", 1))
+    seed = int(config.get("seed", 0))
+
+    return [
+        BenchCell(objective, dataset, solver, repetition, seed)
+        for objective in config["objective"]
+        for dataset in config["dataset"]
+        for solver in config["solver"]
+        for repetition in range(n_repetitions)
+    ]
+
+
+def run_cell(
+    cell: BenchCell,
+    benchmark: str,
+    results_dir: str,
+    timeout: float | None = None,
+    extra_args: list[str] = (),
+) -> str:
+    """
+    Run a single cell with `benchopt run` and write its results shard.
+
+    benchopt runs one repetition of the cell into a private output file.
+    benchopt seeds a single run as its repetition 0, so every repetition is
+    run with its own `run_seed` to make the repetitions independent, and
+    `idx_rep` is then set to the cell's repetition. The shard is
+    written to a temporary file and moved into `results_dir`, so a shard
+    that exists is always complete.
+
+    Returns:
+    --------
+    str
+        Path to the shard
+    """
+    name = f"cell_{cell.key}"
+    command = [
+        "benchopt",
+        "run",
+        benchmark,
+        "-o",
+        cell.objective,
+        "-d",
+        cell.dataset,
+        "-s",
+        cell.solver,
+        "-r",
+        "1",
+        "--seed",
+        str(cell.run_seed),
+        "--no-plot",
+        "--output",
+        name,
+        *extra_args,
+    ]
+    subprocess.run(command, check=True, capture_output=True, text=True, timeout=timeout)
+
+    output = os.path.join(benchmark, "outputs", f"{name}.parquet")
+    table = pq.read_table(output)
+    index = table.schema.get_field_index("idx_rep")
+    table = table.set_column(
+        index, "idx_rep", pa.array([cell.repetition] * table.num_rows, pa.int64())
+    )
+
+    path = os.path.join(results_dir, cell.shard_name)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    os.remove(output)
+
+    return path
+
+
+def run_config(
+    config_path: str,
+    benchmark: str,
+    results_dir: str,
+    max_workers: int = 1,
+    timeout: float | None = None,
+    extra_args: list[str] = (),
+) -> RunReport:
+    """
+    Run all cells of a benchopt config, resuming an interrupted run.
+
+    Cells whose shard already exists in `results_dir` are skipped, and the
+    rest are run by `max_workers` concurrent benchopt processes. The
+    shards sit next to any other parquet files in `results_dir` and are
+    read by the loaders like a single monolithic run.
+
+    Parameters:
+    -----------
+    config_path : str
+        Path to the benchopt config, e.g. `bench_config_single.yml`
+    benchmark : str
+        Path to the benchmark, e.g. `benchmark_slope`
+    results_dir : str
+        Directory to write the shards to, e.g. `results/single_0612`
+    max_workers : int
+        Number of cells to run at the same time
+    timeout : float, optional
+        Timeout in seconds for each cell
+    extra_args : list of str
+        Additional arguments to `benchopt run`
+
+    Returns:
+    --------
+    RunReport
+        Cells that were run, skipped or failed
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    report = RunReport()
+
+    pending = []
+    for cell in expand_config(config_path):
+        if os.path.exists(os.path.join(results_dir, cell.shard_name)):
+            report.skipped.append(cell)
+        else:
+            pending.append(cell)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                run_cell, cell, benchmark, results_dir, timeout, extra_args
+            ): cell
+            for cell in pending
+        }
+
+        for future in as_completed(futures):
+            cell = futures[future]
+            try:
+                future.result()
+                report.done.append(cell)
+            except subprocess.CalledProcessError as e:
+                lines = (e.stderr or "").strip().splitlines()
+                report.errors[cell] = lines[-1] if lines else str(e)
+            except (
+                OSError,
+                subprocess.SubprocessError,
+                pa.ArrowException,
+                ValueError,
+                KeyError,
+            ) as e:
+                report.errors[cell] = f"{type(e).__name__}: {e}"
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a benchopt config cell by cell into resumable shards."
+    )
+    parser.add_argument("config", help="benchopt config file")
+    parser.add_argument("benchmark", help="benchmark directory")
+    parser.add_argument("results_dir", help="directory to write the shards to")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="parallel cells")
+    parser.add_argument("--timeout", type=float, default=None)
+    args, extra_args = parser.parse_known_args(argv)
+
+    report = run_config(
+        args.config,
+        args.benchmark,
+        args.results_dir,
+        max_workers=args.jobs,
+        timeout=args.timeout,
+        extra_args=extra_args,
+    )
+
+    print(
+        f"{len(report.done)} cells run, {len(report.skipped)} skipped, "
+        f"{len(report.errors)} failed"
+    )
+    for cell, error in report.errors.items():
+        print(
+            f"  {cell.solver} on {cell.dataset} ({cell.objective}, "
+            f"repetition {cell.repetition}): {error}"
+        )
+
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .cache import ResultsLoad, default_cache_dir, file_fingerprint, warm_cache
+from .plot_utils import (
+    PATH_RESULTS,
+    PREVIEW_ENV,
+    SINGLE_REAL_RESULTS,
+    SINGLE_SIMULATED_RESULTS,
+)
+
+
+@dataclass(frozen=True)
+class Figure:
+    """A plot script, the results it loads and the files it writes."""
+
+    name: str
+    script: str
+    loads: tuple[ResultsLoad, ...] = ()
+    outputs: tuple[str, ...] = ()
+
+    @property
+    def inputs(self) -> tuple[str, ...]:
+        """Results directories of the loads."""
+        return tuple(dict.fromkeys(load.directory for load in self.loads))
+
+
+# Paths are relative to the repository root, where the scripts are run from
+FIGURES = [
+    Figure(
+        "path",
+        "code/plot_benchmark_path.py",
+        loads=(PATH_RESULTS,),
+        outputs=("images/benchmark_path_real.pdf",),
+    ),
+    Figure(
+        "real",
+        "code/plot_benchmark_real.py",
+        loads=(SINGLE_REAL_RESULTS,),
+        outputs=("images/benchmark_single_real.pdf",),
+    ),
+    Figure(
+        "simul",
+        "code/plot_benchmark_simul.py",
+        loads=(SINGLE_SIMULATED_RESULTS,),
+        outputs=("images/benchmark_single_simulated.pdf",),
+    ),
+    Figure(
+        "thresholding",
+        "code/plot_thresholding.py",
+        outputs=("images/slope-thresholding.pdf",),
+    ),
+    Figure(
+        "example",
+        "code/example.py",
+        outputs=(
+            "images/diabetes-slope-python.pdf",
+            "images/diabetes-lasso-python.pdf",
+            "images/slope-cv-python.pdf",
+        ),
+    ),
+]
+
+
+@dataclass
+class BuildReport:
+    """Summary of a `build` call: figures rendered, up to date and failed."""
+
+    built: dict[str, float] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _input_state(path: Path) -> list[dict]:
+    if path.is_dir():
+        files = sorted(p for p in path.rglob("*") if p.is_file())
+    else:
+        files = [path] if path.exists() else []
+
+    return [file_fingerprint(str(p)) for p in files]
+
+
+def fingerprint(figure: Figure, root: str | Path = ".") -> str:
+    """
+    Fingerprint of everything a figure depends on.
+
+    This covers the contents of its script and of the `slopeutils` sources,
+    the size and modification time of every file of its inputs, and the
+    preview mode, which changes how text is rendered.
+    """
+    root = Path(root)
+    library = Path(__file__).parent
+
+    state = {
+        "script": _digest(root / figure.script),
+        "library": [_digest(p) for p in sorted(library.glob("*.py"))],
+        "inputs": [_input_state(root / path) for path in figure.inputs],
+        "outputs": list(figure.outputs),
+        "preview": os.environ.get(PREVIEW_ENV, ""),
+    }
+    encoded = json.dumps(state, sort_keys=True).encode()
+
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _stamps_path(root: Path) -> Path:
+    key = hashlib.sha256(str(root.resolve()).encode()).hexdigest()[:16]
+    return default_cache_dir() / "build" / f"{key}.json"
+
+
+def _read_stamps(path: Path) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_stamps(path: Path, stamps: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(stamps, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _render(script: str, root: str) -> float:
+    """Run a plot script as `python <script>` would, from `root`."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    os.chdir(root)
+    start = time.perf_counter()
+
+    # Scripts change the rcParams, and a worker may run several of them
+    with matplotlib.rc_context():
+        runpy.run_path(script, run_name="__main__")
+    plt.close("all")
+
+    return time.perf_counter() - start
+
+
+def build(
+    names: list[str] | None = None,
+    root: str | Path = ".",
+    max_workers: int | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+) -> BuildReport:
+    """
+    Render the figures whose inputs changed since they were last built.
+
+    A figure is stale if its fingerprint differs from the one stamped at
+    its last successful build, or if one of its outputs is missing. Stale
+    figures are rendered in parallel worker processes, the slowest ones of
+    the last build first. The cache entries of their loads are written
+    beforehand with `warm_cache`, which reads every results file once even
+    when several figures load it. The workers then memory-map the entries,
+    with only the columns and rows each script needs.
+
+    Parameters:
+    -----------
+    names : list of str, optional
+        Names of the figures to consider, all of `FIGURES` by default
+    root : str or Path
+        Repository root, where the scripts are run from
+    max_workers : int, optional
+        Number of worker processes, one per stale figure by default
+    force : bool
+        Render the figures even if they are up to date
+    dry_run : bool
+        Only report which figures would be rendered
+
+    Returns:
+    --------
+    BuildReport
+        The figures rendered, with their times, skipped and failed
+    """
+    root = Path(root)
+    figures = {figure.name: figure for figure in FIGURES}
+    unknown = set(names or ()) - set(figures)
+    if unknown:
+        raise ValueError(f"Unknown figures: {', '.join(sorted(unknown))}")
+
+    stamps_path = _stamps_path(root)
+    stamps = _read_stamps(stamps_path)
+    report = BuildReport()
+
+    stale = {}
+    for name in names or figures:
+        figure = figures[name]
+        key = fingerprint(figure, root)
+        missing = any(not (root / path).exists() for path in figure.outputs)
+
+        if force or missing or stamps.get(name, {}).get("fingerprint") != key:
+            stale[name] = key
+        else:
+            report.skipped.append(name)
+
+    if dry_run or not stale:
+        report.built = dict.fromkeys(stale, 0.0)
+        return report
+
+    warm_cache([load for name in stale for load in figures[name].loads], root)
+
+    # Forked workers start without importing matplotlib and pandas again
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+
+    # Longest first, so that the build takes about as long as its slowest figure
+    order = sorted(stale, key=lambda n: -stamps.get(n, {}).get("time", 0.0))
+    workers = max_workers or len(order)
+
+    with ProcessPoolExecutor(workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(_render, figures[name].script, str(root.resolve())): name
+            for name in order
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                elapsed = future.result()
+            # A script can fail in any way, which is reported for its figure
+            except Exception as e:  # noqa: BLE001
+                report.errors[name] = f"{type(e).__name__}: {e}"
+                continue
+
+            report.built[name] = elapsed
+            stamps[name] = {"fingerprint": stale[name], "time": elapsed}
+            _write_stamps(stamps_path, stamps)
+
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render the figures whose inputs changed, in parallel."
+    )
+    parser.add_argument(
+        "figures",
+        nargs="*",
+        help="figures to build, all by default: "
+        + ", ".join(figure.name for figure in FIGURES),
+    )
+    parser.add_argument("--root", default=".", help="repository root")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="processes")
+    parser.add_argument("-f", "--force", action="store_true", help="rebuild all")
+    parser.add_argument(
+        "-n", "--dry-run", action="store_true", help="list the stale figures"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        report = build(
+            args.figures or None,
+            args.root,
+            max_workers=args.jobs,
+            force=args.force,
+            dry_run=args.dry_run,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.dry_run:
+        for name in report.built:
+            print(f"  {name}: stale")
+        return 0
+
+    for name, elapsed in report.built.items():
+        print(f"  {name}: built in {elapsed:.1f} s")
+    for name in report.skipped:
+        print(f"  {name}: up to date")
+    for name, error in report.errors.items():
+        print(f"  {name}: {error}")
+
+    print(
+        f"{len(report.built)} figures built, {len(report.skipped)} up to date, "
+        f"{len(report.errors)} failed in {time.perf_counter() - start:.1f} s"
+    )
+
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
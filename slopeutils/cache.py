@@ -0,0 +1,320 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import feather
+
+from .merge_parquet import (
+    LoadReport,
+    find_parquet_files,
+    read_parquet_file,
+    table_to_pandas,
+    unify_tables,
+)
+from .profiling import profiled
+
+CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 1024**3
+
+
+def default_cache_dir() -> Path:
+    """Cache directory, `$SLOPEUTILS_CACHE_DIR` or the user cache directory."""
+    if "SLOPEUTILS_CACHE_DIR" in os.environ:
+        return Path(os.environ["SLOPEUTILS_CACHE_DIR"])
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+
+    return Path(xdg_cache) / "slopeutils"
+
+
+def file_fingerprint(path: str) -> dict:
+    """Identify a file by its absolute path, size and modification time."""
+    stat = os.stat(path)
+
+    return {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+@functools.cache
+def _library_key() -> str:
+    # Transforms call helpers of slopeutils, such as `parse_params`, whose
+    # changes must invalidate the entries too
+    sources = sorted(Path(__file__).parent.glob("*.py"))
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.read_bytes())
+
+    return digest.hexdigest()
+
+
+def _transform_key(transform: Callable | None) -> str | None:
+    if transform is None:
+        return None
+
+    if isinstance(transform, functools.partial):
+        arguments = repr((transform.args, sorted(transform.keywords.items())))
+        return f"{_transform_key(transform.func)}:{arguments}"
+
+    try:
+        source = inspect.getsource(transform)
+    except (OSError, TypeError):
+        source = ""
+
+    return f"{transform.__module__}.{transform.__qualname__}:{source}"
+
+
+def _entry_key(
+    path: str,
+    columns: list[str] | None,
+    filters: pc.Expression | None,
+    transform: Callable | None,
+) -> str:
+    key = [
+        CACHE_VERSION,
+        file_fingerprint(path),
+        columns,
+        None if filters is None else str(filters),
+        _transform_key(transform),
+        _library_key(),
+    ]
+    encoded = json.dumps(key, sort_keys=True).encode()
+
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _write_entry(entry: Path, table: pa.Table, transform: Callable | None) -> pa.Table:
+    if transform is not None:
+        df = transform(table.to_pandas())
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+    table = table.replace_schema_metadata(None)
+
+    tmp = entry.with_suffix(f".{os.getpid()}.tmp")
+    # Compressed entries would be decompressed into new buffers
+    feather.write_feather(table, tmp, compression="uncompressed")
+    os.replace(tmp, entry)
+
+    return table
+
+
+def evict(cache_dir: str | Path, max_bytes: int, keep: set[Path] = frozenset()):
+    """Delete least recently used entries until the cache fits in `max_bytes`."""
+    entries = sorted(
+        Path(cache_dir).glob("*.arrow"), key=lambda p: p.stat().st_mtime_ns
+    )
+    total = sum(p.stat().st_size for p in entries)
+
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if entry in keep:
+            continue
+        total -= entry.stat().st_size
+        entry.unlink(missing_ok=True)
+
+
+@profiled()
+def load_cached_results(
+    directory_path: str,
+    columns: list[str] | None = None,
+    filters: pc.Expression | None = None,
+    transform: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    cache_dir: str | Path | None = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_workers: int | None = None,
+    compact: bool = True,
+) -> tuple[pd.DataFrame | None, LoadReport]:
+    """
+    Load benchopt results like `load_results`, through an on-disk cache.
+
+    Every source parquet file gets its own cache entry: the projected,
+    filtered and transformed table, stored as an uncompressed Arrow IPC
+    file. Entries are keyed by the path, size and modification time of the
+    source file together with the load arguments and the `slopeutils`
+    sources, so adding a run to a results directory only reads and parses
+    the new file. The entries are memory-mapped and merged without copying.
+    Least recently used entries are evicted when the cache grows beyond
+    `max_bytes`.
+
+    Parameters:
+    -----------
+    directory_path : str
+        Path to the directory containing parquet files
+    columns : list of str, optional
+        Columns to keep. All columns are read if None.
+    filters : pyarrow.compute.Expression, optional
+        Row predicate pushed down to the parquet reader
+    transform : callable, optional
+        Function applied to the DataFrame of each file before caching, for
+        instance `extract_reg_param`. It must not depend on rows from
+        other files.
+    cache_dir : str or Path, optional
+        Cache location. Defaults to `default_cache_dir()`.
+    max_bytes : int
+        Size limit of the cache directory
+    max_workers : int, optional
+        Number of reader threads
+    compact : bool
+        Shrink the column types of the result with `compact_table`. The
+        cache entries keep the original types.
+
+    Returns:
+    --------
+    tuple of (pandas.DataFrame or None, LoadReport)
+        Combined DataFrame, or None if no file could be read, and the report
+        of the files read
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    report = LoadReport(files=find_parquet_files(directory_path))
+
+    def load(path):
+        try:
+            key = _entry_key(path, columns, filters, transform)
+            entry = cache_dir / f"{key}.arrow"
+
+            if entry.exists():
+                table = feather.read_table(entry, memory_map=True)
+                os.utime(entry)
+                return entry, table, None
+
+            table = read_parquet_file(path, columns, filters)
+            table = _write_entry(entry, table, transform)
+
+            return entry, table, None
+        except (OSError, pa.ArrowException, ValueError, KeyError) as e:
+            return None, None, f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(load, report.files))
+
+    tables = []
+    used = set()
+    for path, (entry, table, error) in zip(report.files, results):
+        if error is not None:
+            report.errors[path] = error
+        else:
+            report.rows[path] = table.num_rows
+            tables.append(table)
+            used.add(entry)
+
+    evict(cache_dir, max_bytes, keep=used)
+
+    if not tables:
+        return None, report
+
+    df = table_to_pandas(unify_tables(tables), compact)
+
+    return df, report
+
+
+@dataclass(frozen=True)
+class ResultsLoad:
+    """
+    The arguments of a `load_cached_results` call.
+
+    Naming a load lets several scripts share it, and lets `warm_cache`
+    prepare its cache entries ahead of the scripts. `directory` is relative
+    to the `root` the load is run from.
+    """
+
+    directory: str
+    columns: tuple[str, ...] | None = None
+    filters: pc.Expression | None = None
+    transform: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+
+    @property
+    def column_list(self) -> list[str] | None:
+        return None if self.columns is None else list(self.columns)
+
+    def __call__(
+        self, root: str | Path = ".", **kwargs
+    ) -> tuple[pd.DataFrame | None, LoadReport]:
+        """Run the load with `load_cached_results`, passing on `kwargs`."""
+        return load_cached_results(
+            str(Path(root) / self.directory),
+            columns=self.column_list,
+            filters=self.filters,
+            transform=self.transform,
+            **kwargs,
+        )
+
+
+def warm_cache(
+    loads: list[ResultsLoad],
+    root: str | Path = ".",
+    cache_dir: str | Path | None = None,
+    max_workers: int | None = None,
+) -> int:
+    """
+    Write the missing cache entries of several loads, reading each file once.
+
+    Loads of the same results file share a single read of the union of
+    their columns, which every load then projects and filters in memory.
+    A load whose filter needs a column outside that union reads the file
+    on its own. Files that cannot be read are left to the loads to report.
+
+    Returns:
+    --------
+    int
+        Number of results files read
+    """
+    root = Path(root)
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    pending = {}
+    for load in loads:
+        for path in find_parquet_files(str(root / load.directory)):
+            pending.setdefault(path, []).append(load)
+
+    def warm(path) -> bool:
+        try:
+            missing = []
+            for load in pending[path]:
+                key = _entry_key(path, load.column_list, load.filters, load.transform)
+                entry = cache_dir / f"{key}.arrow"
+                if not entry.exists():
+                    missing.append((entry, load))
+
+            if not missing:
+                return False
+
+            columns = None
+            if all(load.columns is not None for _, load in missing):
+                columns = list(
+                    dict.fromkeys(c for _, other in missing for c in other.columns)
+                )
+            shared = read_parquet_file(path, columns)
+
+            for entry, load in missing:
+                table = shared
+                if load.columns is not None:
+                    present = set(table.column_names)
+                    table = table.select([c for c in load.columns if c in present])
+                if load.filters is not None:
+                    try:
+                        table = table.filter(load.filters)
+                    except pa.ArrowInvalid:
+                        table = read_parquet_file(path, load.column_list, load.filters)
+                _write_entry(entry, table, load.transform)
+
+            return True
+        except (OSError, pa.ArrowException, ValueError, KeyError):
+            return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(executor.map(warm, pending))
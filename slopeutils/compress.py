@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .aggregate import CELL_KEYS
+from .merge_parquet import LoadReport, find_parquet_files
+
+
+def trace_mask(
+    df: pd.DataFrame,
+    gap: str = "objective_duality_gap",
+    scale: str | None = "objective_value",
+    keys: list[str] = CELL_KEYS,
+    x: str = "time",
+    tolerance: float = 0.05,
+    envelope: bool = False,
+) -> np.ndarray:
+    """
+    Rows of each convergence trace that matter on a log-scale gap plot.
+
+    A trace is the rows sharing `keys`, ordered by `x`. Its gap is binned
+    into intervals of `tolerance` decades, and within each run of points in
+    the same bin only the first and last are kept, together with the first
+    and last point of the trace. Drawing the kept points as a line deviates
+    from the full trace by less than `tolerance` decades.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Benchopt results
+    gap : str
+        Column with the duality gap
+    scale : str, optional
+        Column the gap is divided by, giving the relative gap with the
+        default. The gap is used as is if None.
+    keys : list of str
+        Columns identifying a trace
+    x : str
+        Column the traces are ordered by
+    tolerance : float
+        Bin width in decades of the gap
+    envelope : bool
+        Keep only points that improve on the smallest gap so far, so each
+        trace reduces to its monotone envelope
+
+    Returns:
+    --------
+    numpy.ndarray
+        Boolean mask of the rows to keep, aligned with `df`
+    """
+    n = len(df)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    codes = [pd.factorize(df[key], use_na_sentinel=False)[0] for key in keys]
+    order = np.lexsort([df[x].to_numpy()] + codes[::-1])
+
+    values = df[gap].to_numpy(dtype=float)
+    if scale is not None:
+        values = values / df[scale].to_numpy(dtype=float)
+    values = values[order]
+
+    # Start of a new trace, in sorted order
+    first = np.zeros(n, dtype=bool)
+    first[0] = True
+    for code in codes:
+        first[1:] |= code[order][1:] != code[order][:-1]
+
+    candidates = np.arange(n)
+    if envelope:
+        trace = np.cumsum(first) - 1
+        best = pd.Series(values).groupby(trace).cummin().to_numpy()
+        improves = np.r_[True, values[1:] < best[:-1]]
+        last = np.r_[first[1:], True]
+        candidates = np.flatnonzero(first | improves | last)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bins = np.floor(np.log10(values[candidates]) / tolerance)
+
+    starts = first[candidates]
+    ends = np.r_[starts[1:], True]
+    changed = np.r_[True, bins[1:] != bins[:-1]]
+
+    keep_sorted = starts | ends | changed | np.r_[changed[1:], True]
+
+    mask = np.zeros(n, dtype=bool)
+    mask[order[candidates[keep_sorted]]] = True
+
+    return mask
+
+
+def compress_traces(df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    """
+    Keep only the rows of each trace selected by `trace_mask`.
+
+    Can be passed as the `transform` of `load_cached_results`, e.g. with
+    `functools.partial(compress_traces, tolerance=0.1)`, to compress each
+    file as it is loaded.
+    """
+    return df[trace_mask(df, **kwargs)].reset_index(drop=True)
+
+
+def compress_results(
+    directory_path: str,
+    output_path: str,
+    gap: str = "objective_duality_gap",
+    scale: str | None = "objective_value",
+    keys: list[str] = CELL_KEYS,
+    x: str = "time",
+    tolerance: float = 0.05,
+    envelope: bool = False,
+) -> LoadReport:
+    """
+    Write compressed copies of the result files of a directory.
+
+    Each parquet file is compressed with `trace_mask` and written under the
+    same name to `output_path`, keeping all of its columns and its schema.
+    Files are written to a temporary name first and then renamed.
+
+    Returns:
+    --------
+    LoadReport
+        Files written and the number of rows kept in each
+    """
+    os.makedirs(output_path, exist_ok=True)
+    report = LoadReport(files=find_parquet_files(directory_path))
+    columns = list(dict.fromkeys([*keys, x, gap] + ([scale] if scale else [])))
+
+    for path in report.files:
+        try:
+            table = pq.read_table(path)
+            df = table.select(columns).to_pandas()
+            mask = trace_mask(df, gap, scale, keys, x, tolerance, envelope)
+            compressed = table.filter(pa.array(mask))
+
+            target = os.path.join(output_path, os.path.basename(path))
+            tmp = f"{target}.tmp"
+            pq.write_table(compressed, tmp, compression="zstd")
+            os.replace(tmp, target)
+
+            report.rows[path] = compressed.num_rows
+        except (OSError, pa.ArrowException, ValueError, KeyError) as e:
+            report.errors[path] = f"{type(e).__name__}: {e}"
+
+    return report
@@ -0,0 +1,208 @@
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .datasets import load_design, share_design
+
+# Design matrix and response of a worker process, loaded once by `_init_worker`
+_shared = {}
+
+
+def _init_worker(spec):
+    _shared["X"], _shared["y"] = load_design(spec)
+
+
+def _training_rows(X, start: int, stop: int):
+    """
+    Rows of `X` outside [start, stop), in circular order from `stop`.
+
+    Dense rows are copied straight into a Fortran-ordered array, the layout
+    sortedl1 fits without a further copy.
+    """
+    n, p = X.shape
+    if sp.issparse(X):
+        rows = np.arange(stop, start + n) % n
+        return sp.csc_matrix(X[rows])
+
+    out = np.empty((n - (stop - start), p), order="F")
+    out[: n - stop] = X[stop:]
+    out[n - stop :] = X[:start]
+    return out
+
+
+def _fit_fold(i, j, start, stop, params, alphas):
+    from sortedl1 import Slope
+
+    # The shuffled design is stored once, so the test rows [start, stop) are
+    # a view of the memory map and the training rows wrap around its end
+    X, y = _shared["X"], _shared["y"]
+    X_train = _training_rows(X, start, stop)
+    y_train = np.concatenate((y[stop:], y[:start]))
+    fit = Slope(**params).path(X_train, y_train, alphas=alphas)
+
+    coefs = np.asarray(fit.coefs)[:, 0, :]
+    intercepts = np.ravel(fit.intercepts)
+    predictions = X[start:stop] @ coefs + intercepts
+    residuals = y[start:stop, None] - predictions
+    scores = np.full(len(alphas), np.nan)
+    scores[: coefs.shape[1]] = np.mean(residuals**2, axis=0)
+
+    return i, j, scores
+
+
+def cross_validate(
+    X,
+    y,
+    model=None,
+    q=(0.1,),
+    n_folds: int = 10,
+    path_length: int = 100,
+    alpha_min_ratio: float | None = None,
+    seed: int = 0,
+    max_workers: int | None = None,
+):
+    """
+    Cross-validate a sortedl1 `Slope` over q and alpha with a process pool.
+
+    This is a parallel `Slope.cv`: every fold and q is a separate job that
+    fits a warm-started path with `Slope.path`, and the scores are
+    collected as jobs complete into the `CvResults` that `Slope.cv`
+    returns, so `plot()` and the `best_*` fields work as usual.
+
+    The design is written once to memory-mapped `.npy` files in a temporary
+    directory, with its rows shuffled, so workers share its pages instead of
+    receiving a pickled copy. The folds are contiguous blocks of it: the
+    test rows are a view, and the training rows wrap around its end and are
+    copied once into the Fortran-ordered array that sortedl1 fits.
+
+    All folds for a given q share the alpha grid of the full data, so their
+    scores line up.
+
+    Parameters:
+    -----------
+    X : array_like or scipy.sparse matrix, shape (n, p)
+        Design matrix
+    y : array_like, shape (n,)
+        Response
+    model : sortedl1.Slope, optional
+        Model whose parameters the paths are fit with, `Slope()` by default.
+        Its `q` is replaced by each value of `q`.
+    q : list of float
+        False discovery rates to try
+    n_folds : int
+        Number of folds
+    path_length : int
+        Number of alphas per path
+    alpha_min_ratio : float, optional
+        Ratio of the last alpha to the first. Defaults to 1e-2 if n < p and
+        1e-4 otherwise.
+    seed : int
+        Seed for the fold assignment
+    max_workers : int, optional
+        Number of worker processes, defaulting to the number of CPUs
+
+    Returns:
+    --------
+    sortedl1.CvResults
+        Mean squared error for every q, fold and alpha, NaN where a fold's
+        path stopped early, and its mean and standard error over the folds
+    """
+    from sortedl1 import Slope
+    from sortedl1.results import CvResults
+
+    X = sp.csc_matrix(X, dtype=float) if sp.issparse(X) else np.asarray(X, float)
+    y = np.asarray(y, dtype=float)
+    n, p = X.shape
+    q = np.atleast_1d(np.asarray(q, dtype=float))
+    model = Slope() if model is None else model
+
+    if alpha_min_ratio is None:
+        alpha_min_ratio = 1e-2 if n < p else 1e-4
+
+    order = np.random.default_rng(seed).permutation(n)
+    bounds = np.cumsum([0] + [len(fold) for fold in np.array_split(order, n_folds)])
+    params = [{**model.get_params(), "q": float(q_i)} for q_i in q]
+
+    # A path of length one only computes the alpha where all coefficients
+    # are zero
+    alphas = np.array(
+        [
+            np.geomspace(alpha_max, alpha_max * alpha_min_ratio, path_length)
+            for alpha_max in (
+                Slope(**params_i).path(X, y, path_length=1).alphas[0]
+                for params_i in params
+            )
+        ]
+    )
+    scores = np.full((len(q), n_folds, path_length), np.nan)
+
+    with tempfile.TemporaryDirectory(prefix="slopeutils-cv-") as directory:
+        spec = share_design(X, y, directory, rows=order)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(spec,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _fit_fold, i, j, bounds[j], bounds[j + 1], params[i], alphas[i]
+                )
+                for i in range(len(q))
+                for j in range(n_folds)
+            ]
+
+            for future in as_completed(futures):
+                i, j, fold_scores = future.result()
+                scores[i, j] = fold_scores
+
+    counts = np.sum(~np.isnan(scores), axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.nanmean(scores, axis=1)
+        errors = np.nanstd(scores, axis=1) / np.sqrt(counts)
+
+    best_ind, best_alpha_ind = np.unravel_index(np.nanargmin(means), means.shape)
+
+    return CvResults(
+        best_score=float(means[best_ind, best_alpha_ind]),
+        best_ind=int(best_ind),
+        best_alpha_ind=int(best_alpha_ind),
+        metric="mse",
+        scores=list(scores),
+        means=list(means),
+        errors=list(errors),
+        alphas=list(alphas),
+        params=[{"q": float(q_i), "gamma": 1.0} for q_i in q],
+    )
+
+
+def cv_table(result) -> pd.DataFrame:
+    """
+    Summary table of `CvResults`, one row per parameter set and alpha.
+
+    Columns are the parameters, `alpha`, the `mean` score over the folds, its
+    standard error `se` and the number of folds `n_folds` that reached the
+    alpha.
+    """
+    return pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    **params,
+                    "alpha": alphas,
+                    "mean": means,
+                    "se": errors,
+                    "n_folds": np.sum(~np.isnan(scores), axis=0),
+                }
+            )
+            for params, alphas, means, errors, scores in zip(
+                result.params,
+                result.alphas,
+                result.means,
+                result.errors,
+                result.scores,
+            )
+        ],
+        ignore_index=True,
+    )
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .cache import default_cache_dir
+from .params import parse_params
+
+STORE_VERSION = 2
+
+
+def default_store_dir() -> Path:
+    """Dataset store, `$SLOPEUTILS_DATA_DIR` or `datasets` in the cache directory."""
+    if "SLOPEUTILS_DATA_DIR" in os.environ:
+        return Path(os.environ["SLOPEUTILS_DATA_DIR"])
+
+    return default_cache_dir() / "datasets"
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    A dataset loaded from the store, with memory-mapped arrays.
+
+    Attributes:
+    -----------
+    key : str
+        Dataset parameters, e.g. `breheny[dataset=brca1,standardize=True]`
+    X : numpy.ndarray or scipy.sparse.csc_matrix
+        Design matrix, standardized if the dataset was stored with
+        `standardize=True`
+    y : numpy.ndarray
+        Response
+    center : numpy.ndarray
+        Column means subtracted from X, zero for sparse designs
+    scale : numpy.ndarray
+        Column scales X was divided by
+    col_norms : numpy.ndarray
+        Euclidean norms of the columns of X
+    """
+
+    key: str
+    X: np.ndarray | sp.csc_matrix
+    y: np.ndarray
+    center: np.ndarray
+    scale: np.ndarray
+    col_norms: np.ndarray
+
+
+def dataset_dir(
+    key: str, store_dir: str | Path | None = None, standardized: bool = True
+) -> Path:
+    """
+    Directory of a dataset in the store.
+
+    The key is parsed with `parse_params`, so the order of the parameters
+    does not matter. Standardized and raw versions of a dataset are
+    separate entries.
+    """
+    name, params = parse_params(key)
+    encoded = json.dumps(
+        [STORE_VERSION, name, params, standardized], sort_keys=True
+    ).encode()
+    store_dir = Path(store_dir) if store_dir is not None else default_store_dir()
+
+    return store_dir / hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def share_design(X, y, directory: str | Path, rows=None) -> dict:
+    """
+    Write `X` and `y` to `.npy` files that processes can memory-map.
+
+    `rows` selects the rows to write, in order and possibly repeated, all of
+    them by default. Dense rows are written in chunks, so no copy of the
+    selection is made in memory. Sparse matrices are stored as their CSC
+    components. Returns the spec that `load_design` takes.
+    """
+    n, p = X.shape
+    rows = np.arange(n) if rows is None else np.asarray(rows)
+    spec = {
+        "directory": str(directory),
+        "shape": [len(rows), p],
+        "sparse": sp.issparse(X),
+    }
+
+    arrays = {"y": np.asarray(y, dtype=float)[rows]}
+    if spec["sparse"]:
+        X = sp.csc_matrix(sp.csr_matrix(X, dtype=float)[rows])
+        arrays.update(data=X.data, indices=X.indices, indptr=X.indptr)
+    else:
+        X = np.asarray(X, dtype=float)
+        out = np.lib.format.open_memmap(
+            os.path.join(directory, "X.npy"), mode="w+", shape=(len(rows), p)
+        )
+        chunk = max(1, 2**24 // max(p, 1))
+        for start in range(0, len(rows), chunk):
+            out[start : start + chunk] = X[rows[start : start + chunk]]
+        out.flush()
+        del out
+
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+
+    return spec
+
+
+def load_design(spec: dict):
+    """Memory-map the design written by `share_design`, without copying it."""
+
+    def load(name):
+        return np.load(os.path.join(spec["directory"], f"{name}.npy"), mmap_mode="r")
+
+    if spec["sparse"]:
+        X = sp.csc_matrix(
+            (load("data"), load("indices"), load("indptr")),
+            shape=tuple(spec["shape"]),
+            copy=False,
+        )
+    else:
+        X = load("X")
+
+    return X, load("y")
+
+
+def standardize(X):
+    """
+    Standardize the columns of X to zero mean and unit variance.
+
+    Sparse matrices are only scaled, to keep them sparse. Constant columns
+    are left unscaled.
+
+    Returns:
+    --------
+    tuple
+        The standardized X, and the centers and scales of the columns
+    """
+    if sp.issparse(X):
+        X = sp.csc_matrix(X, dtype=float)
+        mean = np.asarray(X.mean(axis=0)).ravel()
+        mean_sq = np.asarray(X.multiply(X).mean(axis=0)).ravel()
+        scale = np.sqrt(np.maximum(mean_sq - mean**2, 0))
+        scale[scale == 0] = 1.0
+        return X @ sp.diags(1 / scale), np.zeros(X.shape[1]), scale
+
+    X = np.asarray(X, dtype=float)
+    center = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+
+    return (X - center) / scale, center, scale
+
+
+def column_norms(X) -> np.ndarray:
+    """Euclidean norms of the columns of X."""
+    if sp.issparse(X):
+        return np.sqrt(np.asarray(X.multiply(X).sum(axis=0)).ravel())
+
+    return np.linalg.norm(X, axis=0)
+
+
+@contextmanager
+def dataset_entry(
+    key: str, store_dir: str | Path | None = None, standardized: bool = True
+):
+    """
+    Write a store entry atomically.
+
+    Yields a temporary directory for the entry's files, which is renamed to
+    the entry once the block exits without an error, so concurrent writers
+    and interrupted conversions never leave a partial entry. If another
+    writer completed the entry first, its entry is kept and the new files
+    are discarded, since entries with the same key hold the same data.
+    """
+    directory = dataset_dir(key, store_dir, standardized)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".tmp-"))
+
+    try:
+        yield tmp_dir
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    try:
+        os.rename(tmp_dir, directory)
+        return
+    except OSError:
+        pass
+
+    if not (directory / "meta.json").exists():
+        # Left over by an older version: move it aside in one rename, so
+        # that readers never see it half deleted
+        stale = Path(tempfile.mkdtemp(dir=directory.parent, prefix=".old-"))
+        with suppress(OSError):
+            os.replace(directory, stale / "entry")
+        with suppress(OSError):
+            os.rename(tmp_dir, directory)
+        shutil.rmtree(stale, ignore_errors=True)
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if not (directory / "meta.json").exists():
+        raise OSError(f"Could not write the store entry of {key} to {directory}")
+
+
+def write_metadata(
+    directory: str | Path, key: str, shape: tuple, sparse: bool, standardized: bool
+):
+    """Write the `meta.json` that `load_dataset` reads the design layout from."""
+    meta = {
+        "key": key,
+        "shape": list(shape),
+        "sparse": sparse,
+        "standardized": standardized,
+    }
+    with open(Path(directory) / "meta.json", "w") as f:
+        json.dump(meta, f)
+
+
+def store_dataset(
+    key: str,
+    X,
+    y,
+    standardize_X: bool = True,
+    store_dir: str | Path | None = None,
+) -> Path:
+    """
+    Convert a dataset once into memory-mappable files in the store.
+
+    Dense designs are stored as a single `.npy` file and sparse ones as
+    the `.npy` components of a CSC matrix, along with the response and the
+    precomputed column centers, scales and norms.
+
+    Parameters:
+    -----------
+    key : str
+        Dataset parameters, e.g. `breheny[dataset=brca1,standardize=True]`
+    X : array_like or scipy.sparse matrix, shape (n, p)
+        Design matrix
+    y : array_like, shape (n,)
+        Response
+    standardize_X : bool
+        Whether to standardize the columns of X before storing it
+    store_dir : str or Path, optional
+        Dataset store, defaulting to `default_store_dir()`
+
+    Returns:
+    --------
+    Path
+        Directory of the stored dataset
+    """
+    if standardize_X:
+        X, center, scale = standardize(X)
+    else:
+        center, scale = np.zeros(X.shape[1]), np.ones(X.shape[1])
+
+    with dataset_entry(key, store_dir, standardize_X) as tmp_dir:
+        share_design(X, y, tmp_dir)
+        np.save(tmp_dir / "center.npy", center)
+        np.save(tmp_dir / "scale.npy", scale)
+        np.save(tmp_dir / "col_norms.npy", column_norms(X))
+        write_metadata(tmp_dir, key, X.shape, sp.issparse(X), standardize_X)
+
+    return dataset_dir(key, store_dir, standardize_X)
+
+
+def load_dataset(
+    key: str, store_dir: str | Path | None = None, standardized: bool = True
+) -> Dataset:
+    """
+    Load a dataset from the store without copying it.
+
+    All arrays are memory-mapped, so loading is instant and processes that
+    load the same dataset share its pages. `standardized` selects the
+    version stored with or without `standardize_X`.
+
+    Raises:
+    -------
+    FileNotFoundError
+        If the dataset is not in the store
+    """
+    directory = dataset_dir(key, store_dir, standardized)
+
+    if not (directory / "meta.json").exists():
+        raise FileNotFoundError(f"Dataset not in store: {key}")
+
+    with open(directory / "meta.json") as f:
+        meta = json.load(f)
+
+    X, y = load_design({**meta, "directory": str(directory)})
+
+    def load(name):
+        return np.load(directory / f"{name}.npy", mmap_mode="r")
+
+    return Dataset(
+        key=meta["key"],
+        X=X,
+        y=y,
+        center=load("center"),
+        scale=load("scale"),
+        col_norms=load("col_norms"),
+    )
+
+
+def cached_dataset(
+    key: str,
+    loader: Callable,
+    standardize_X: bool = True,
+    store_dir: str | Path | None = None,
+) -> Dataset:
+    """
+    Load a dataset from the store, converting it with `loader` on first use.
+
+    Examples:
+    ---------
+    >>> diabetes = cached_dataset(
+    ...     "diabetes", lambda: read_csv_design("data/diabetes.csv", "V1")
+    ... )
+    """
+    try:
+        return load_dataset(key, store_dir, standardize_X)
+    except FileNotFoundError:
+        X, y = loader()
+        store_dataset(key, X, y, standardize_X, store_dir)
+        return load_dataset(key, store_dir, standardize_X)
+
+
+def read_csv_design(path: str, response: str) -> tuple[np.ndarray, np.ndarray]:
+    """Read a design matrix and the `response` column from a CSV file."""
+    df = pd.read_csv(path)
+    y = df.pop(response).to_numpy(dtype=float)
+
+    return df.to_numpy(dtype=float), y
@@ -0,0 +1,431 @@
+from collections.abc import Callable
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from .plot_utils import FULL_WIDTH, legend_labels
+from .profiling import profiled
+
+MARKERS = ["o", "s", "^", "D", "*", "x", "+", "v", "<", ">", "p", "h", "H", "d"]
+
+# Resolution traces are decimated to, and the length above which their
+# markers are spaced along the line instead of drawn at every point
+DECIMATE_DPI = 300
+MAX_MARKERS = 50
+MARKER_SPACING = 0.03
+
+
+def solver_styles(solver_values: list[str]) -> tuple[dict, dict]:
+    """Colors and markers for each solver, in the order given."""
+    colors = plt.cm.tab10(np.linspace(0, 1, len(solver_values)))
+    solver_colors = dict(zip(solver_values, colors))
+    solver_markers = dict(zip(solver_values, MARKERS[: len(solver_values)]))
+
+    return solver_colors, solver_markers
+
+
+def decimate(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_buckets: int,
+    x_range: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """
+    Points of a trace that are visible at a given horizontal resolution.
+
+    The x range is cut into `n_buckets` columns of equal width, and in each
+    column only the first and last points and those with the smallest and
+    largest `y` are kept. The line through the kept points covers the same
+    pixels as the full trace, on a linear or log y scale alike, while
+    having at most four points per column. Points outside `x_range` fall in
+    a column on either side. Traces that are already short enough are
+    returned whole.
+
+    Parameters:
+    -----------
+    x, y : numpy.ndarray
+        Coordinates of the trace, sorted by `x`
+    n_buckets : int
+        Number of columns, typically the width of the axes in pixels
+    x_range : tuple of float, optional
+        Visible x range, by default the range of the trace
+
+    Returns:
+    --------
+    numpy.ndarray
+        Sorted indices of the points to draw
+    """
+    n = len(x)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    x_min, x_max = x_range if x_range is not None else (x[0], x[-1])
+    width = (x_max - x_min) / n_buckets or 1.0
+    bucket = np.clip(np.floor((x - x_min) / width), -1, n_buckets)
+
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    # Within each run of a column, sorted by y: the first is the minimum
+    # and the last the maximum
+    order = np.lexsort((y, bucket))
+
+    return np.unique(np.r_[starts, ends, order[starts], order[ends]])
+
+
+def trace_options(
+    n_points: int,
+    max_markers: int = MAX_MARKERS,
+    marker_spacing: float = MARKER_SPACING,
+    rasterize_above: int | None = None,
+) -> dict:
+    """Marker spacing and rasterization of a drawn trace of `n_points` points."""
+    return {
+        "markevery": marker_spacing if n_points > max_markers else None,
+        "rasterized": rasterize_above is not None and n_points > rasterize_above,
+    }
+
+
+def axes_buckets(ax: plt.Axes, dpi: float = DECIMATE_DPI) -> int:
+    """Width of an axes in pixels at `dpi`."""
+    width = ax.get_position().width * ax.figure.get_figwidth()
+    return max(int(width * dpi), 1)
+
+
+@profiled()
+def facet_groups(
+    df: pd.DataFrame, keys: list[str], sort_by: str = "time"
+) -> tuple[pd.DataFrame, dict[tuple, slice]]:
+    """
+    Partition a table into contiguous, sorted groups.
+
+    The table is sorted once by `keys` and then `sort_by`, after which every
+    group occupies a contiguous block of rows. Slicing the sorted table, or
+    its columns as NumPy arrays, with the returned slices gives views of
+    each group in `sort_by` order without copying.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Table to partition
+    keys : list of str
+        Columns identifying a group, e.g. `["dataset", "reg", "solver_name"]`
+    sort_by : str
+        Column to order the rows of each group by
+
+    Returns:
+    --------
+    tuple of (pandas.DataFrame, dict)
+        The sorted table and a mapping from group keys to row slices
+    """
+    sorted_df = df.sort_values(keys + [sort_by], kind="stable", ignore_index=True)
+
+    grouped = sorted_df.groupby(keys, sort=False, observed=True, dropna=False)
+    groups = {
+        key if isinstance(key, tuple) else (key,): slice(idx[0], idx[-1] + 1)
+        for key, idx in grouped.indices.items()
+    }
+
+    return sorted_df, groups
+
+
+@profiled()
+def facet_limits(
+    df: pd.DataFrame,
+    keys: list[str],
+    hue: str,
+    x: str = "time",
+    y: str = "rel_gap",
+    target: float = 1e-6,
+    margin: float = 5,
+    how: str = "min",
+    pad: float = 0.05,
+    ylim: tuple[float, float] | None = None,
+    overrides: dict | None = None,
+) -> dict[tuple, tuple]:
+    """
+    Compute the axis limits of every facet from the data.
+
+    For each curve, the first `x` at which `y` falls to `target` or below is
+    found in a single grouped aggregation. These times are reduced over the
+    curves of a facet with `how`, so that with the defaults the x axis
+    extends to `margin` times the time at which the fastest solver reaches
+    the target. Facets where no curve reaches the target extend to their
+    largest `x`.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Benchmark results
+    keys : list of str
+        Columns identifying a facet, in the order used for the keys of the
+        result, e.g. `["reg", "dataset"]` for `plot_facets`
+    hue : str
+        Column identifying the curves within a facet
+    x, y : str
+        Time and convergence measure columns
+    target : float
+        Value of `y` that counts as converged
+    margin : float
+        Factor applied to the reduced time to target
+    how : str
+        Reduction over the curves of a facet, e.g. "min", "median" or "max"
+    pad : float
+        Fraction of the upper limit added as padding below zero
+    ylim : tuple of float, optional
+        Fixed y limits for all facets. Taken from the data if None.
+    overrides : dict, optional
+        Manual limits, keyed like the result, that replace the computed ones
+
+    Returns:
+    --------
+    dict
+        Limits `(x_min, x_max, y_min, y_max)` keyed by facet
+    """
+    curves = (
+        df[keys + [hue, x, y]]
+        .assign(hit_time=df[x].where(df[y] <= target))
+        .groupby(keys + [hue], observed=True)
+        .agg(
+            hit_time=("hit_time", "min"),
+            x_max=(x, "max"),
+            y_min=(y, "min"),
+            y_max=(y, "max"),
+        )
+    )
+    facets = curves.groupby(level=keys, observed=True).agg(
+        hit_time=("hit_time", how),
+        x_max=("x_max", "max"),
+        y_min=("y_min", "min"),
+        y_max=("y_max", "max"),
+    )
+
+    x_max = (margin * facets["hit_time"]).fillna(facets["x_max"])
+
+    limits = {}
+    for key, upper, y_min, y_max in zip(
+        facets.index, x_max, facets["y_min"], facets["y_max"]
+    ):
+        key = key if isinstance(key, tuple) else (key,)
+        y_min, y_max = ylim if ylim is not None else (y_min, y_max)
+        limits[key] = (-pad * upper, upper, y_min, y_max)
+
+    if overrides is not None:
+        limits.update(overrides)
+
+    return limits
+
+
+@profiled()
+def plot_facets(
+    df: pd.DataFrame,
+    row: str,
+    col: str,
+    hue: str,
+    x: str,
+    y: str,
+    row_values: list | None = None,
+    col_values: list | None = None,
+    hue_values: list | None = None,
+    col_label: Callable = str,
+    row_label: Callable = str,
+    limits: dict | None = None,
+    figsize: tuple = (FULL_WIDTH, 8),
+    xlabel: str = "Time (s)",
+    ylabel: str = "Relative Duality Gap",
+    legend_ncol: int = 3,
+    legend_markersize: float = 5,
+    legend_label: Callable = legend_labels,
+    decimate_traces: bool = True,
+    dpi: float = DECIMATE_DPI,
+    max_markers: int = MAX_MARKERS,
+    marker_spacing: float = MARKER_SPACING,
+    rasterize_above: int | None = None,
+    bands: tuple[str, str] | None = None,
+    band_axis: str = "y",
+    band_alpha: float = 0.2,
+) -> tuple[plt.Figure, np.ndarray, dict]:
+    """
+    Plot convergence curves on a grid of facets.
+
+    The table is partitioned once with `facet_groups`, so the cost of
+    preparing the data of a panel does not grow with the number of panels
+    and curves. Each panel shows one curve per `hue` value on a log-scaled
+    y axis, with facet labels on the top and right margins and a shared
+    legend on top.
+
+    Long traces are reduced with `decimate` to the resolution of their
+    panel, so the size and drawing time of the figure are bounded by the
+    size of the canvas rather than by the length of the traces. Their
+    markers are then spaced evenly along the line rather than drawn at
+    every point, and they can be rasterized inside vector output.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Benchmark results
+    row, col, hue : str
+        Columns defining the facet rows, facet columns and curves
+    x, y : str
+        Columns to plot against each other
+    row_values, col_values, hue_values : list, optional
+        Values (and order) of the facets and curves. Default to the sorted
+        unique values.
+    col_label : callable
+        Function returning the title of a facet column from its value
+    row_label : callable
+        Function returning the label of a facet row from its value
+    limits : dict, optional
+        Axis limits `(x_min, x_max, y_min, y_max)` keyed by `(col, row)`
+    figsize : tuple
+        Figure size in inches
+    xlabel, ylabel : str
+        Figure-level axis labels
+    legend_ncol : int
+        Maximum number of legend columns
+    legend_markersize : float
+        Marker size in the legend
+    legend_label : callable
+        Function returning the legend label of a curve from its `hue` value
+    decimate_traces : bool
+        Reduce traces with more than four points per pixel column
+    dpi : float
+        Resolution the traces are decimated to
+    max_markers : int
+        Length above which markers are spaced along a trace
+    marker_spacing : float
+        Distance between these markers, as a fraction of the axes diagonal
+    rasterize_above : int, optional
+        Rasterize the traces with more points than this, drawn after
+        decimation. Nothing is rasterized if None.
+    bands : tuple of str, optional
+        Columns with the lower and upper bounds of a band drawn around each
+        curve, such as those of `repetition_bands`
+    band_axis : str
+        Axis the bands extend along, "y", or "x" for bands of times
+    band_alpha : float
+        Opacity of the bands
+
+    Returns:
+    --------
+    tuple of (Figure, numpy.ndarray, dict)
+        The figure, its axes and the plotted lines keyed by
+        `(row, col, hue)`
+    """
+    if row_values is None:
+        row_values = sorted(df[row].unique())
+    if col_values is None:
+        col_values = sorted(df[col].unique())
+    if hue_values is None:
+        hue_values = sorted(df[hue].unique())
+    if limits is None:
+        limits = {}
+
+    sorted_df, groups = facet_groups(df, [row, col, hue], sort_by=x)
+    x_values = sorted_df[x].to_numpy()
+    y_values = sorted_df[y].to_numpy()
+    if bands is not None:
+        lower_values = sorted_df[bands[0]].to_numpy(dtype=float)
+        upper_values = sorted_df[bands[1]].to_numpy(dtype=float)
+
+    hue_colors, hue_markers = solver_styles(hue_values)
+
+    fig, axes = plt.subplots(
+        len(row_values),
+        len(col_values),
+        figsize=figsize,
+        sharex=False,
+        sharey=True,
+        constrained_layout=True,
+        squeeze=False,
+    )
+
+    lines = {}
+
+    for i, row_value in enumerate(row_values):
+        for j, col_value in enumerate(col_values):
+            ax = axes[i, j]
+            facet_key = (col_value, row_value)
+            x_range = limits[facet_key][:2] if facet_key in limits else None
+            n_buckets = axes_buckets(ax, dpi)
+
+            for hue_value in hue_values:
+                rows = groups.get((row_value, col_value, hue_value))
+
+                if rows is None:
+                    continue
+
+                trace_x, trace_y = x_values[rows], y_values[rows]
+
+                if bands is not None:
+                    lower, upper = lower_values[rows], upper_values[rows]
+                    fill = ax.fill_between if band_axis == "y" else ax.fill_betweenx
+                    fill(
+                        trace_x if band_axis == "y" else trace_y,
+                        lower,
+                        upper,
+                        where=np.isfinite(lower) & np.isfinite(upper),
+                        color=hue_colors[hue_value],
+                        alpha=band_alpha,
+                        linewidth=0,
+                    )
+
+                if decimate_traces:
+                    keep = decimate(trace_x, trace_y, n_buckets, x_range)
+                    trace_x, trace_y = trace_x[keep], trace_y[keep]
+
+                (lines[row_value, col_value, hue_value],) = ax.semilogy(
+                    trace_x,
+                    trace_y,
+                    **trace_options(
+                        len(trace_x), max_markers, marker_spacing, rasterize_above
+                    ),
+                    marker=hue_markers[hue_value],
+                    linestyle="-",
+                    color=hue_colors[hue_value],
+                    label=hue_value,
+                    markerfacecolor="white",
+                    markeredgecolor=hue_colors[hue_value],
+                )
+
+            ax.set_yscale("log")
+
+            if j == len(col_values) - 1:
+                ax.yaxis.set_label_position("right")
+                ax.set_ylabel(row_label(row_value), rotation=270, va="bottom")
+
+            if i == 0:
+                ax.set_title(col_label(col_value))
+
+            if facet_key in limits:
+                x_min, x_max, y_min, y_max = limits[facet_key]
+                ax.set_xlim(x_min, x_max)
+                ax.set_ylim(y_min, y_max)
+
+    fig.supxlabel(xlabel)
+    fig.supylabel(ylabel)
+
+    handles, labels = [], []
+    for hue_value in hue_values:
+        line = plt.Line2D(
+            [0],
+            [0],
+            color=hue_colors[hue_value],
+            marker=hue_markers[hue_value],
+            linestyle="-",
+            markerfacecolor="white",
+            markeredgecolor=hue_colors[hue_value],
+            markersize=legend_markersize,
+        )
+        handles.append(line)
+        labels.append(legend_label(hue_value))
+
+    fig.legend(
+        handles,
+        labels,
+        loc="outside upper center",
+        ncol=min(legend_ncol, len(hue_values)),
+    )
+
+    return fig, axes, lines
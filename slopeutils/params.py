@@ -0,0 +1,169 @@
+import re
+from collections.abc import Callable
+from functools import cache
+
+import pandas as pd
+
+from .profiling import profiled
+
+_NAME_RE = re.compile(r"^\s*([^\[]*?)\s*(?:\[(.*)\])?\s*$")
+_INT_RE = re.compile(r"^[+-]?\d+$")
+_FLOAT_RE = re.compile(r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$")
+_CONSTANTS = {"True": True, "False": False, "None": None}
+
+
+def _split_params(params: str) -> list[str]:
+    """Split on top-level commas, leaving bracketed values intact."""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(params):
+        if char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(params[start:i])
+            start = i + 1
+    parts.append(params[start:])
+
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _convert(value: str):
+    if value in _CONSTANTS:
+        return _CONSTANTS[value]
+    if _INT_RE.match(value):
+        return int(value)
+    if _FLOAT_RE.match(value):
+        return float(value)
+    return value
+
+
+@cache
+def parse_params(string: str) -> tuple[str, dict]:
+    """
+    Parse a benchopt parameter string.
+
+    `"SLOPE[fit_intercept=False,q=0.2,reg=0.5]"` becomes
+    `("SLOPE", {"fit_intercept": False, "q": 0.2, "reg": 0.5})`. Values are
+    converted to bool, int or float where possible. Results are memoized, so
+    each distinct string is only parsed once.
+    """
+    name, params = _NAME_RE.match(string).groups()
+
+    values = {}
+    for part in _split_params(params or ""):
+        key, _, value = part.partition("=")
+        values[key.strip()] = _convert(value.strip())
+
+    return name, values
+
+
+def _typed_column(values: list) -> pd.Series:
+    present = [value for value in values if value is not None]
+
+    if present and all(isinstance(value, bool) for value in present):
+        return pd.Series(values, dtype="boolean")
+
+    if present and all(type(value) is int for value in present):
+        return pd.Series(
+            values, dtype="int64" if len(present) == len(values) else "Int64"
+        )
+
+    if present and all(isinstance(value, int | float) for value in present):
+        return pd.Series(values, dtype="float64")
+
+    strings = [None if value is None else str(value) for value in values]
+
+    return pd.Series(strings, dtype="category")
+
+
+def param_table(values) -> pd.DataFrame:
+    """
+    Lookup table of parsed parameters, with one row per unique string.
+
+    The table is indexed by the original strings and has a `name` column
+    along with one column per parameter. Parameters missing from a string
+    are NA. Numeric parameters get numeric dtypes and string parameters are
+    categoricals.
+    """
+    uniques = pd.unique(pd.Series(values, dtype=object).dropna())
+    parsed = [parse_params(string) for string in uniques]
+
+    columns = {"name": [name for name, _ in parsed]}
+    for _, params in parsed:
+        for key in params:
+            columns.setdefault(key, None)
+    for key in columns:
+        if key != "name":
+            columns[key] = [params.get(key) for _, params in parsed]
+
+    table = pd.DataFrame({key: _typed_column(value) for key, value in columns.items()})
+    table.index = pd.Index(uniques, name="string")
+
+    return table
+
+
+@profiled()
+def map_unique(series: pd.Series, func: Callable) -> pd.Series:
+    """Apply `func` once per unique value of `series` and broadcast back."""
+    codes, uniques = pd.factorize(series)
+    mapped = pd.Series([func(value) for value in uniques])
+
+    # Missing values have code -1, which reindexing maps to NA
+    result = mapped.reindex(codes)
+    result.index = series.index
+
+    return result.rename(series.name)
+
+
+def parse_param_column(
+    series: pd.Series, params: list[str] | None = None, prefix: str = ""
+) -> pd.DataFrame:
+    """
+    Parse a column of parameter strings into typed columns.
+
+    Strings are factorized and only the unique values are parsed, after
+    which the lookup table is broadcast to the rows through the codes.
+    String-valued parameters are returned as categoricals.
+
+    Parameters:
+    -----------
+    series : pandas.Series
+        Column of parameter strings, e.g. `df["objective_name"]`
+    params : list of str, optional
+        Parameters to extract. All parameters, and the name, if None.
+    prefix : str
+        Prefix added to the names of the returned columns
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One column per parameter, aligned with `series`
+    """
+    codes, uniques = pd.factorize(series)
+    table = param_table(uniques).reset_index(drop=True)
+
+    if params is not None:
+        table = table.reindex(columns=params)
+
+    # Missing strings have code -1, which reindexing maps to NA
+    result = {
+        prefix + column: table[column].reindex(codes).array for column in table.columns
+    }
+
+    return pd.DataFrame(result, index=series.index)
+
+
+@profiled()
+def extract_params(
+    df: pd.DataFrame, column: str, params: list[str] | None = None, prefix: str = ""
+) -> pd.DataFrame:
+    """Add the parameters parsed from `df[column]` as columns of `df`."""
+    parsed = parse_param_column(df[column], params, prefix)
+
+    for name in parsed.columns:
+        df[name] = parsed[name]
+
+    return df
@@ -0,0 +1,291 @@
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import svds
+from scipy.stats import norm
+
+from .prox import prox_slope
+from .slope import dual_norm_slope, get_clusters
+
+
+def lambda_sequence(p: int, q: float = 0.1, kind: str = "bh") -> np.ndarray:
+    """
+    Lambda sequence for SLOPE.
+
+    Parameters:
+    -----------
+    p : int
+        Number of features
+    q : float
+        False discovery rate for the Benjamini–Hochberg sequence
+    kind : str
+        "bh" for the Benjamini–Hochberg sequence or "lasso" for a constant one
+
+    Returns:
+    --------
+    numpy.ndarray
+        Non-increasing lambda sequence of length `p`
+    """
+    if kind == "bh":
+        return norm.ppf(1 - q * np.arange(1, p + 1) / (2 * p))
+    if kind == "lasso":
+        return np.ones(p)
+
+    raise ValueError(f"Unknown lambda sequence: {kind}")
+
+
+@dataclass(frozen=True)
+class SlopePath:
+    """
+    SLOPE solutions along a regularization path.
+
+    Attributes:
+    -----------
+    alphas : numpy.ndarray
+        Scaling of the lambda sequence at each step
+    lambdas : numpy.ndarray
+        Lambda sequence
+    coefs : numpy.ndarray
+        Coefficients, with one column per step
+    gaps : numpy.ndarray
+        Duality gap at each step
+    n_iter : numpy.ndarray
+        Number of solver iterations at each step
+    n_violations : numpy.ndarray
+        Number of KKT violations found after screening at each step
+    n_clusters : numpy.ndarray
+        Number of nonzero clusters at each step
+    """
+
+    alphas: np.ndarray
+    lambdas: np.ndarray
+    coefs: np.ndarray
+    gaps: np.ndarray
+    n_iter: np.ndarray
+    n_violations: np.ndarray
+    n_clusters: np.ndarray
+
+
+def strong_set(gradient: np.ndarray, lambdas: np.ndarray) -> np.ndarray:
+    """
+    Features kept by the strong rule for SLOPE (Larsson et al., 2020).
+
+    The features are taken in decreasing order of `|gradient|` and the rule
+    keeps the longest prefix whose blocks all satisfy `sum(c_j - lambda_j)
+    >= 0`. With `s` the cumulative sums of `c - lambdas`, a block ends at
+    every index where `s` reaches its running maximum, so the prefix is
+    found without a loop.
+
+    Parameters:
+    -----------
+    gradient : numpy.ndarray
+        Gradient of the loss, or its estimate at the next step
+    lambdas : numpy.ndarray
+        Non-increasing lambda sequence to screen against
+
+    Returns:
+    --------
+    numpy.ndarray
+        Indices of the kept features, sorted
+    """
+    c = np.abs(gradient)
+    order = np.argsort(-c, kind="stable")
+    s = np.cumsum(c[order] - lambdas)
+    running_max = np.maximum.accumulate(np.concatenate(([0.0], s)))
+    ends = np.flatnonzero(s >= running_max[:-1])
+    k = ends[-1] + 1 if ends.size else 0
+
+    return np.sort(order[:k])
+
+
+def _spectral_norm(X) -> float:
+    if min(X.shape) == 1:
+        return float(np.sqrt((X.multiply(X) if sp.issparse(X) else X**2).sum()))
+
+    return float(svds(X, k=1, return_singular_vectors=False)[0])
+
+
+def _duality_gap(X, y, beta, lambdas, alpha) -> tuple[float, float]:
+    n = X.shape[0]
+    residual = y - X @ beta
+    penalty = alpha * np.sort(np.abs(beta))[::-1] @ lambdas
+    primal = residual @ residual / (2 * n) + penalty
+
+    # Rescale the residual into the dual feasible set
+    scale = max(1.0, dual_norm_slope(X, residual / n, alpha * lambdas))
+    dual_residual = y - residual / scale
+    dual = (y @ y - dual_residual @ dual_residual) / (2 * n)
+
+    return primal - dual, primal
+
+
+def _fista(X, y, beta, lambdas, alpha, step, tol, max_iter, gap_freq=10):
+    """Accelerated proximal gradient descent for a single alpha."""
+    n = X.shape[0]
+    z = beta.copy()
+    t = 1.0
+    gap = np.inf
+
+    for it in range(1, max_iter + 1):
+        gradient = -(X.T @ (y - X @ z)) / n
+        beta_new = prox_slope(z - step * gradient, step * alpha * lambdas)
+
+        t_new = (1 + np.sqrt(1 + 4 * t**2)) / 2
+        z = beta_new + (t - 1) / t_new * (beta_new - beta)
+        beta, t = beta_new, t_new
+
+        if it % gap_freq == 0 or it == max_iter:
+            gap, primal = _duality_gap(X, y, beta, lambdas, alpha)
+            if gap <= tol * primal:
+                break
+
+    return beta, it, gap
+
+
+def slope_path(
+    X,
+    y,
+    lambdas=None,
+    q: float = 0.1,
+    alphas=None,
+    path_length: int = 100,
+    alpha_min_ratio: float | None = None,
+    tol: float = 1e-6,
+    max_iter: int = 10000,
+    screening: bool = True,
+    max_clusters: int | None = None,
+) -> SlopePath:
+    """
+    Fit SLOPE along a regularization path.
+
+    Solves `min_beta ||y - X beta||^2 / (2n) + alpha * sum_j lambda_j
+    |beta|_(j)` for a decreasing sequence of alphas, without an intercept,
+    using accelerated proximal gradient descent warm started from the
+    previous solution. With `screening`, each step is solved only over the
+    features kept by the strong rule and those already active. The KKT
+    conditions are then checked on all features and violators are added
+    back until there are none.
+
+    Parameters:
+    -----------
+    X : array_like or scipy.sparse matrix, shape (n, p)
+        Design matrix
+    y : array_like, shape (n,)
+        Response
+    lambdas : array_like, optional
+        Lambda sequence. Defaults to the Benjamini–Hochberg sequence.
+    q : float
+        False discovery rate of the default lambda sequence
+    alphas : array_like, optional
+        Decreasing path of alphas. Defaults to a logarithmic grid from the
+        smallest alpha with an all-zero solution.
+    path_length : int
+        Number of alphas in the default grid
+    alpha_min_ratio : float, optional
+        Ratio of the last alpha to the first in the default grid. Defaults
+        to 1e-2 if n < p and 1e-4 otherwise.
+    tol : float
+        Tolerance on the duality gap, relative to the primal objective
+    max_iter : int
+        Maximum number of iterations per step, at least 1
+    screening : bool
+        Whether to use the strong screening rule
+    max_clusters : int, optional
+        Stop the path once the solution has more nonzero clusters than
+        this. Defaults to n + 1.
+
+    Returns:
+    --------
+    SlopePath
+        Solutions and solver statistics at each step
+    """
+    if max_iter < 1:
+        raise ValueError(f"max_iter must be at least 1, got {max_iter}")
+
+    X = sp.csc_matrix(X, dtype=float) if sp.issparse(X) else np.asarray(X, float)
+    y = np.asarray(y, dtype=float)
+    n, p = X.shape
+
+    if lambdas is None:
+        lambdas = lambda_sequence(p, q)
+    lambdas = np.asarray(lambdas, dtype=float)
+
+    if max_clusters is None:
+        max_clusters = n + 1
+
+    alpha_max = dual_norm_slope(X, y / n, lambdas)
+
+    if alphas is None:
+        if alpha_min_ratio is None:
+            alpha_min_ratio = 1e-2 if n < p else 1e-4
+        alphas = np.geomspace(alpha_max, alpha_max * alpha_min_ratio, path_length)
+    alphas = np.asarray(alphas, dtype=float)
+
+    step = n / _spectral_norm(X) ** 2
+
+    beta = np.zeros(p)
+    gradient = -(X.T @ y) / n
+    coefs, gaps, n_iter, n_violations, n_clusters = [], [], [], [], []
+
+    for i, alpha in enumerate(alphas):
+        previous = alphas[i - 1] if i > 0 else max(alpha, alpha_max)
+
+        if screening:
+            strong = strong_set(gradient, (2 * alpha - previous) * lambdas)
+            working = np.union1d(strong, np.flatnonzero(beta))
+        else:
+            working = np.arange(p)
+
+        violations = 0
+        while True:
+            if working.size:
+                beta_working, it, gap = _fista(
+                    X[:, working],
+                    y,
+                    beta[working],
+                    lambdas[: working.size],
+                    alpha,
+                    step,
+                    tol,
+                    max_iter,
+                )
+            else:
+                beta_working, it, gap = np.zeros(0), 0, 0.0
+
+            beta = np.zeros(p)
+            beta[working] = beta_working
+            gradient = -(X.T @ (y - X @ beta)) / n
+
+            if not screening:
+                break
+
+            missing = np.setdiff1d(strong_set(gradient, alpha * lambdas), working)
+            if not missing.size:
+                break
+
+            violations += missing.size
+            working = np.union1d(working, missing)
+
+        clusters = get_clusters(beta)
+
+        coefs.append(beta)
+        gaps.append(gap)
+        n_iter.append(it)
+        n_violations.append(violations)
+        n_clusters.append(np.count_nonzero(clusters.values))
+
+        if n_clusters[-1] > max_clusters:
+            break
+
+    n_steps = len(coefs)
+
+    return SlopePath(
+        alphas=alphas[:n_steps],
+        lambdas=lambdas,
+        coefs=np.column_stack(coefs),
+        gaps=np.array(gaps),
+        n_iter=np.array(n_iter),
+        n_violations=np.array(n_violations),
+        n_clusters=np.array(n_clusters),
+    )
@@ -1,8 +1,34 @@
+import os
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import pandas as pd
+
+from .cache import ResultsLoad, default_cache_dir
+from .merge_parquet import contains
+from .params import extract_params, parse_params
 
 FULL_WIDTH = 6
 
+PREVIEW_ENV = "SLOPEUTILS_PREVIEW"
+
+TEX_PREAMBLE = (
+    r"\usepackage{mathtools}\usepackage{lmodern}\usepackage{bm}\usepackage{siunitx}"
+)
+
+PGD_LABELS = {
+    "bb": "BB PGD",
+    "fista": "FISTA",
+    "anderson": "Anderson PGD",
+}
+
+SOLVER_LABELS = {
+    "ADMM": "ADMM",
+    "sortedl1": "sortedl1",
+    "PGD_safe_screening": "Safe PGD",
+    "SlopePath": "SolutionPath",
+    "Newt-ALM": "Newt-ALM",
+}
+
 
 def reg_labels(reg):
     """Create a label for the regularization parameter."""
@@ -11,41 +37,120 @@ def reg_labels(reg):
 
 
 def extract_reg_param(df):
-    df["reg"] = df["objective_name"].str.extract(r"reg=([0-9.]+)")
-    df["reg"] = pd.to_numeric(df["reg"])
+    return extract_params(df, "objective_name", ["reg"])
+
+
+def extract_path_length(df):
+    return extract_params(df, "objective_name", ["path_length"])
+
+
+SINGLE_COLUMNS = (
+    "objective_name",
+    "data_name",
+    "solver_name",
+    "idx_rep",
+    "stop_val",
+    "time",
+    "objective_value",
+    "objective_duality_gap",
+)
+
+# The results the benchmark figures are drawn from. The build warms their
+# cache entries together, so that the figures sharing a results directory
+# read it only once.
+SINGLE_REAL_RESULTS = ResultsLoad(
+    "results/single_0612",
+    columns=SINGLE_COLUMNS,
+    filters=contains("data_name", "breheny|libsvm"),
+    transform=extract_reg_param,
+)
+
+SINGLE_SIMULATED_RESULTS = ResultsLoad(
+    "results/single_0612",
+    columns=SINGLE_COLUMNS,
+    filters=contains("data_name", "Simulated"),
+    transform=extract_reg_param,
+)
+
+PATH_RESULTS = ResultsLoad(
+    "results/path_0623",
+    columns=(
+        "objective_name",
+        "data_name",
+        "solver_name",
+        "idx_rep",
+        "stop_val",
+        "time",
+        "objective_value",
+        "objective_max_rel_duality_gap",
+    ),
+    transform=extract_path_length,
+)
+
 
-    return df
+def tex_cache_dir() -> Path:
+    """LaTeX cache, `$SLOPEUTILS_TEX_CACHE` or `tex` in the cache directory."""
+    if "SLOPEUTILS_TEX_CACHE" in os.environ:
+        return Path(os.environ["SLOPEUTILS_TEX_CACHE"])
 
+    return default_cache_dir() / "tex"
+
+
+def use_tex_cache(directory: str | Path | None = None):
+    """
+    Keep Matplotlib's rendered LaTeX snippets in a shared directory.
+
+    Matplotlib names each snippet by a hash of its source, preamble and font
+    size. Pinning the directory lets every plot script, build worker and
+    environment reuse the same snippets across runs, regardless of their
+    Matplotlib configuration directory.
+    """
+    from matplotlib.texmanager import TexManager
+
+    directory = Path(directory) if directory is not None else tex_cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if hasattr(TexManager, "_cache_dir"):
+        TexManager._cache_dir = directory
+    else:
+        TexManager.texcache = str(directory)
+
+
+def set_plot_defaults(preview: bool | None = None):
+    """
+    Set the Matplotlib style of the paper's figures.
+
+    Text is typeset with LaTeX, with rendered snippets cached by
+    `use_tex_cache`. In preview mode, which is the default when
+    `SLOPEUTILS_PREVIEW` is set, text is rendered by mathtext in Computer
+    Modern instead, which needs no LaTeX installation and is much faster.
+    """
+    if preview is None:
+        preview = os.environ.get(PREVIEW_ENV, "") not in ("", "0")
 
-def set_plot_defaults():
-    plt.rcParams["text.usetex"] = True
     plt.rcParams["font.size"] = 9
     plt.rcParams["axes.labelsize"] = 10
     plt.rcParams["axes.titlesize"] = 10
     plt.rcParams["lines.markersize"] = 3
     plt.rcParams["lines.linewidth"] = 1
     plt.rcParams["legend.frameon"] = False
-    plt.rcParams["text.latex.preamble"] = (
-        r"\usepackage{mathtools}\usepackage{lmodern}\usepackage{bm}\usepackage{siunitx}"
-    )
+
+    if preview:
+        plt.rcParams["text.usetex"] = False
+        plt.rcParams["mathtext.fontset"] = "cm"
+        plt.rcParams["font.family"] = "serif"
+        plt.rcParams["font.serif"] = ["cmr10"]
+        plt.rcParams["axes.formatter.use_mathtext"] = True
+    else:
+        plt.rcParams["text.usetex"] = True
+        plt.rcParams["text.latex.preamble"] = TEX_PREAMBLE
+        use_tex_cache()
 
 
 def legend_labels(solver):
-    if "PGD[acceleration=bb" in solver:
-        return "BB PGD"
-    elif "PGD[acceleration=fista" in solver:
-        return "FISTA"
-    elif "ADMM" in solver:
-        return "ADMM"
-    elif "sortedl1" in solver:
-        return "sortedl1"
-    elif "PGD_safe_screening" in solver:
-        return "Safe PGD"
-    elif "SlopePath" in solver:
-        return "SolutionPath"
-    elif "PGD[acceleration=anderson" in solver:
-        return "Anderson PGD"
-    elif "Newt-ALM" in solver:
-        return "Newt-ALM"
-    else:
-        return solver
+    name, params = parse_params(solver)
+
+    if name == "PGD" and params.get("acceleration") in PGD_LABELS:
+        return PGD_LABELS[params["acceleration"]]
+
+    return SOLVER_LABELS.get(name, solver)
@@ -0,0 +1,300 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_ENV = "SLOPEUTILS_PROFILE"
+
+_enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+_records = []
+_local = threading.local()
+_start = time.perf_counter()
+
+# Running stages of all threads, whose peaks are updated at every reset of
+# the kernel's high-water mark, and the highest mark seen before a reset
+_active = []
+_peak_lock = threading.Lock()
+_process_peak = 0
+
+
+def enabled() -> bool:
+    """Whether stages are being recorded."""
+    return _enabled
+
+
+def enable(report: str | None = None):
+    """Start recording stages, and write the report at exit."""
+    global _enabled
+
+    if report is not None:
+        os.environ[PROFILE_ENV] = report
+    if not _enabled:
+        _enabled = True
+        atexit.register(write_report)
+
+
+def peak_rss() -> int | None:
+    """
+    Peak resident set size of the process in bytes, if available.
+
+    This is the high-water mark since the process started, so it never
+    decreases and does not isolate any one stage.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Kilobytes on Linux, bytes on macOS
+    peak = peak if sys.platform == "darwin" else peak * 1024
+
+    # Resetting the high-water mark for stages also resets ru_maxrss
+    return max(peak, _process_peak)
+
+
+def current_rss() -> int | None:
+    """Current resident set size of the process in bytes, on Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _high_water_mark() -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return None
+
+
+def reset_peak_rss() -> int | None:
+    """
+    Peak resident set size since the last reset, in bytes, on Linux.
+
+    The kernel's high-water mark is then reset to the current resident set
+    size by writing to `/proc/self/clear_refs`. Running stages take the peak
+    into account, so measuring a block of code does not disturb them.
+    Returns None where the mark cannot be read or reset.
+    """
+    global _process_peak
+
+    with _peak_lock:
+        peak = _high_water_mark()
+        if peak is None:
+            return None
+
+        try:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        except OSError:
+            return None
+
+        _process_peak = max(_process_peak, peak)
+        for running in _active:
+            if running.peak is not None:
+                running.peak = max(running.peak, peak)
+
+        return peak
+
+
+class _Stage:
+    """A running stage; set `rows` or call `update` to add to its record."""
+
+    def __init__(self, name, info):
+        self.name = name
+        self.info = info
+        self.rows = None
+        self.peak = None
+
+    def update(self, **info):
+        self.info.update(info)
+
+    def __enter__(self):
+        self.stack = getattr(_local, "stack", ())
+        _local.stack = (*self.stack, self.name)
+        self.rss_start = current_rss()
+        if reset_peak_rss() is not None:
+            self.peak = self.rss_start
+        with _peak_lock:
+            _active.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        if reset_peak_rss() is None:
+            self.peak = None
+        with _peak_lock:
+            _active.remove(self)
+
+        _records.append(
+            {
+                "name": self.name,
+                "stack": ";".join(_local.stack),
+                "start": self.start - _start,
+                "time": elapsed,
+                "rss_start": self.rss_start,
+                "rss_end": current_rss(),
+                "peak_rss": self.peak,
+                "process_peak_rss": peak_rss(),
+                "rows": self.rows,
+                **self.info,
+            }
+        )
+        _local.stack = self.stack
+        return False
+
+
+class _NullStage:
+    """Stand-in for `_Stage` when profiling is off, ignoring everything."""
+
+    rows = None
+
+    def update(self, **info):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, **info):
+    """
+    Record the wall time, memory and row count of a pipeline stage.
+
+    Used as a context manager. When profiling is off, this returns a shared
+    no-op object, so instrumented code costs one function call. The memory
+    of a stage is its resident set size at entry and exit, in `rss_start`
+    and `rss_end`, its peak resident set size while it ran, in `peak_rss`,
+    and the peak of the whole process so far, in `process_peak_rss`. The
+    stage peak is only measured on Linux, with `reset_peak_rss`.
+
+    Examples:
+    ---------
+    >>> with stage("load", directory=results_dir) as s:
+    ...     df = merge_parquet_files(results_dir)
+    ...     s.rows = len(df)
+    """
+    if not _enabled:
+        return _NULL_STAGE
+
+    return _Stage(name, info)
+
+
+def _count_rows(result):
+    if isinstance(result, tuple) and result:
+        result = result[0]
+
+    return len(result) if hasattr(result, "shape") and result.shape else None
+
+
+def profiled(name: str | None = None):
+    """
+    Decorator recording every call of a function as a stage.
+
+    The stage is named after the function unless `name` is given, and its
+    row count is taken from a returned DataFrame, Series or array, or from
+    the first element of a returned tuple.
+    """
+
+    def decorator(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            with _Stage(stage_name, {}) as s:
+                result = func(*args, **kwargs)
+                s.rows = _count_rows(result)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def report() -> dict:
+    """The stages recorded so far, with totals for the process."""
+    return {
+        "script": sys.argv[0],
+        "total_time": time.perf_counter() - _start,
+        "peak_rss": peak_rss(),
+        "stages": list(_records),
+    }
+
+
+def collapsed_stacks() -> list[str]:
+    """
+    Stages in the collapsed stack format of flamegraph.pl and speedscope.
+
+    Each line is a stack of stage names and its self time in microseconds,
+    that is, its time minus the time of the stages nested in it.
+    """
+    self_time = {}
+    for record in _records:
+        stack = record["stack"]
+        self_time[stack] = self_time.get(stack, 0.0) + record["time"]
+        parent = stack.rpartition(";")[0]
+        if parent:
+            self_time[parent] = self_time.get(parent, 0.0) - record["time"]
+
+    script = Path(sys.argv[0]).stem or "python"
+
+    return [
+        f"{script};{stack} {max(round(seconds * 1e6), 0)}"
+        for stack, seconds in self_time.items()
+    ]
+
+
+def write_report(path: str | None = None):
+    """
+    Write the report as JSON and as collapsed stacks.
+
+    The files are `<path>.json` and `<path>.folded`, and missing parent
+    directories are created. By default `path` is the value of
+    `SLOPEUTILS_PROFILE`, or `<script>.profile` in the working directory if
+    it is set to 1.
+    """
+    if path is None:
+        value = os.environ.get(PROFILE_ENV, "1")
+        path = value if value not in ("1", "true") else None
+    if path is None:
+        path = f"{Path(sys.argv[0]).stem or 'python'}.profile"
+
+    path = str(path).removesuffix(".json").removesuffix(".folded")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    with open(f"{path}.json", "w") as f:
+        json.dump(report(), f, indent=2)
+    with open(f"{path}.folded", "w") as f:
+        f.write("\n".join(collapsed_stacks()) + "\n")
+
+
+if _enabled:
+    atexit.register(write_report)
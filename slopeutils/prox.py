@@ -0,0 +1,105 @@
+import numpy as np
+
+
+def _pava(z, sums, lengths, means, out):
+    """
+    Non-increasing isotonic regression of `z`, clipped at zero.
+
+    Stack-based pool-adjacent-violators: each element starts a new block,
+    which absorbs the blocks on top of the stack as long as the block
+    averages are not decreasing, and is then pushed. `sums`, `lengths` and
+    `means` are preallocated stacks of length at least `len(z)`, and the
+    block means are written to `out`.
+    """
+    # Memory views index the buffers with Python scalars, much faster than
+    # indexing the arrays themselves
+    sums, lengths, means = memoryview(sums), memoryview(lengths), memoryview(means)
+    top = -1
+
+    for value in memoryview(z):
+        total, length, mean = value, 1, value
+
+        while top >= 0 and means[top] <= mean:
+            total += sums[top]
+            length += lengths[top]
+            mean = total / length
+            top -= 1
+
+        top += 1
+        sums[top] = total
+        lengths[top] = length
+        means[top] = mean
+
+    view = memoryview(out)
+    stop = 0
+    for block in range(top + 1):
+        begin, stop = stop, stop + lengths[block]
+        if stop - begin == 1:
+            view[begin] = max(means[block], 0.0)
+        else:
+            out[begin:stop] = max(means[block], 0.0)
+
+    return out
+
+
+def prox_slope(v, lambdas):
+    """
+    Proximal operator of the sorted L1 norm.
+
+    Uses the stack-based pool-adjacent-violators algorithm (FastProxSL1) of
+    Bogdan et al. (2015) and runs in O(p log p) time, dominated by the sort.
+
+    Parameters:
+    -----------
+    v : array_like, shape (p,)
+        Point to evaluate the operator at
+    lambdas : array_like, shape (p,)
+        Non-increasing, non-negative lambda sequence
+
+    Returns:
+    --------
+    numpy.ndarray, shape (p,)
+        The solution of `argmin_x 0.5 * ||x - v||^2 + sum_j lambdas_j |x|_(j)`
+    """
+    return prox_slope_batch(np.asarray(v)[None, :], lambdas)[0]
+
+
+def prox_slope_batch(V, lambdas):
+    """
+    Proximal operator of the sorted L1 norm for many vectors at once.
+
+    All rows are sorted in one call and the pool-adjacent-violators stacks
+    are allocated once and reused for every row.
+
+    Parameters:
+    -----------
+    V : array_like, shape (m, p)
+        Points to evaluate the operator at, one per row
+    lambdas : array_like, shape (p,) or (m, p)
+        Non-increasing, non-negative lambda sequence, shared by all rows or
+        one per row
+
+    Returns:
+    --------
+    numpy.ndarray, shape (m, p)
+        The operator applied to each row of `V`
+    """
+    V = np.asarray(V, dtype=float)
+    m, p = V.shape
+    lambdas = np.broadcast_to(np.asarray(lambdas, dtype=float), (m, p))
+
+    order = np.argsort(-np.abs(V), axis=1)
+    z = np.take_along_axis(np.abs(V), order, axis=1) - lambdas
+
+    sums = np.empty(p)
+    lengths = np.empty(p, dtype=np.intp)
+    means = np.empty(p)
+    sorted_out = np.empty((m, p))
+
+    for row in range(m):
+        _pava(z[row], sums, lengths, means, sorted_out[row])
+
+    out = np.empty_like(V)
+    np.put_along_axis(out, order, sorted_out, axis=1)
+
+    return np.sign(V) * out
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field, replace
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .facets import facet_groups
+from .merge_parquet import find_parquet_files, results_dataset
+
+# How partial aggregates of each batch are combined, and what they are
+# computed from. The mean is carried as a sum and a count.
+_PARTIALS = {
+    "min": [("min", "min")],
+    "max": [("max", "max")],
+    "sum": [("sum", "sum")],
+    "count": [("count", "sum")],
+    "mean": [("sum", "sum"), ("count", "sum")],
+}
+
+
+@dataclass(frozen=True)
+class ResultQuery:
+    """
+    Lazy query over a directory of benchopt results.
+
+    A query is built up with `filter`, `select`, `group_by` and `aggregate`,
+    which return new queries without reading any data. `collect` then scans
+    the parquet files batch by batch: filters and projections are evaluated
+    by the scanner and aggregations are reduced incrementally, so only the
+    result is materialized.
+
+    Examples:
+    ---------
+    >>> gap = pc.divide(pc.field("objective_duality_gap"),
+    ...                 pc.field("objective_value"))
+    >>> (scan_results("results/single_0612")
+    ...     .filter(contains("data_name", "Simulated"))
+    ...     .select(["solver_name", "time"], rel_gap=gap)
+    ...     .group_by(["solver_name"])
+    ...     .aggregate({"time": ["max"], "rel_gap": ["min"]})
+    ...     .collect())
+    """
+
+    files: tuple[str, ...]
+    predicate: pc.Expression | None = None
+    columns: dict[str, pc.Expression] | None = None
+    keys: tuple[str, ...] = ()
+    aggregations: dict[str, tuple[str, ...]] = field(default_factory=dict)
+    batch_size: int = 65536
+
+    def filter(self, predicate: pc.Expression) -> "ResultQuery":
+        """Keep rows matching `predicate`, combined with earlier filters."""
+        if self.predicate is not None:
+            predicate = self.predicate & predicate
+
+        return replace(self, predicate=predicate)
+
+    def select(
+        self, columns: list[str] | None = None, **expressions: pc.Expression
+    ) -> "ResultQuery":
+        """Keep `columns` and add columns computed from `expressions`."""
+        projection = {name: pc.field(name) for name in columns or []}
+        projection.update(expressions)
+
+        return replace(self, columns=projection)
+
+    def group_by(self, keys: list[str]) -> "ResultQuery":
+        """Group rows by `keys` for a subsequent `aggregate`."""
+        return replace(self, keys=tuple(keys))
+
+    def aggregate(self, aggregations: dict[str, list[str]]) -> "ResultQuery":
+        """
+        Aggregate each group, e.g. `{"time": ["min", "max"]}`.
+
+        Supported functions are min, max, sum, count and mean. The result
+        has a column `<column>_<function>` for every aggregation.
+        """
+        for functions in aggregations.values():
+            unknown = set(functions) - set(_PARTIALS)
+            if unknown:
+                raise ValueError(f"Unsupported aggregations: {sorted(unknown)}")
+
+        aggregations = {
+            column: tuple(functions) for column, functions in aggregations.items()
+        }
+
+        return replace(self, aggregations=aggregations)
+
+    def _needed_columns(self) -> dict[str, pc.Expression] | None:
+        if self.columns is None and not self.aggregations:
+            return None
+
+        needed = dict(self.columns or {})
+        for name in [*self.keys, *self.aggregations]:
+            needed.setdefault(name, pc.field(name))
+
+        return needed
+
+    def iter_batches(self):
+        """Scan the files, yielding filtered and projected record batches."""
+        if not self.files:
+            return
+
+        dataset = results_dataset(list(self.files))
+        scanner = dataset.scanner(
+            columns=self._needed_columns(),
+            filter=self.predicate,
+            batch_size=self.batch_size,
+        )
+
+        for batch in scanner.to_batches():
+            if batch.num_rows > 0:
+                yield batch
+
+    def collect(self) -> pd.DataFrame:
+        """Execute the query and return the result as a DataFrame."""
+        if self.aggregations:
+            return self._collect_aggregate()
+
+        batches = list(self.iter_batches())
+
+        if not batches:
+            return pd.DataFrame(columns=list(self._needed_columns() or []))
+
+        return pa.Table.from_batches(batches).to_pandas()
+
+    def collect_facets(
+        self, keys: list[str], sort_by: str = "time"
+    ) -> tuple[pd.DataFrame, dict[tuple, slice]]:
+        """Execute the query and partition the result with `facet_groups`."""
+        return facet_groups(self.collect(), keys, sort_by)
+
+    def _collect_aggregate(self) -> pd.DataFrame:
+        keys = list(self.keys)
+        partial_specs = []
+        combine_specs = []
+        for column, functions in self.aggregations.items():
+            for function in functions:
+                for partial, combine in _PARTIALS[function]:
+                    name = f"{column}_{partial}"
+                    if (column, partial) not in partial_specs:
+                        partial_specs.append((column, partial))
+                        combine_specs.append((name, combine))
+
+        # Names of the combined partials, e.g. time_min_min, back to time_min
+        renames = {f"{name}_{combine}": name for name, combine in combine_specs}
+
+        state = None
+        for batch in self.iter_batches():
+            table = pa.Table.from_batches([batch])
+            partial = table.group_by(keys).aggregate(partial_specs)
+
+            if state is not None:
+                combined = pa.concat_tables([state, partial])
+                partial = combined.group_by(keys).aggregate(combine_specs)
+                partial = partial.rename_columns(
+                    [renames.get(name, name) for name in partial.column_names]
+                )
+
+            state = partial
+
+        if state is None:
+            names = [
+                f"{column}_{function}"
+                for column, functions in self.aggregations.items()
+                for function in functions
+            ]
+            return pd.DataFrame(columns=keys + names)
+
+        partials = state.to_pandas()
+
+        result = partials[keys].copy()
+        for column, functions in self.aggregations.items():
+            for function in functions:
+                if function == "mean":
+                    values = partials[f"{column}_sum"] / partials[f"{column}_count"]
+                else:
+                    values = partials[f"{column}_{function}"]
+                result[f"{column}_{function}"] = values
+
+        return result.sort_values(keys, ignore_index=True) if keys else result
+
+
+def scan_results(directory_path: str, batch_size: int = 65536) -> ResultQuery:
+    """Start a lazy `ResultQuery` over all parquet files in a directory."""
+    return ResultQuery(
+        files=tuple(find_parquet_files(directory_path)), batch_size=batch_size
+    )
@@ -0,0 +1,288 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.signal import lfilter
+
+from .datasets import Dataset, dataset_entry, load_dataset, write_metadata
+
+# Columns drawn from each random stream. Part of the output's definition:
+# changing it changes the designs generated from a given seed.
+BLOCK_SIZE = 256
+
+
+def _rng(seed: int, *key: int) -> np.random.Generator:
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=key))
+
+
+def _bernoulli_positions(rng, size: int, density: float) -> np.ndarray:
+    """Sorted positions of the successes among `size` Bernoulli trials."""
+    if density == 0:
+        return np.empty(0, dtype=np.int64)
+
+    expected = size * density
+    positions = np.empty(0, dtype=np.int64)
+    last = -1
+
+    while last < size:
+        draws = int(expected + 6 * np.sqrt(expected) + 16)
+        batch = last + np.cumsum(rng.geometric(density, size=draws))
+        positions = np.concatenate((positions, batch))
+        last = batch[-1]
+
+    return positions[positions < size]
+
+
+class _DesignState:
+    """What a block needs from the blocks before it."""
+
+    def __init__(self, seed, n_samples, rho, correlation):
+        start = _rng(seed, 0)
+        if correlation == "ar":
+            # Column -1, so that the first column is already stationary
+            self.previous = start.standard_normal(n_samples)
+            self.last_value = np.zeros(n_samples)
+            self.last_column = np.full(n_samples, np.iinfo(np.int64).min // 2)
+        else:
+            self.common = np.sqrt(rho) * start.standard_normal(n_samples)
+
+
+def _dense_block(rng, state, width, n_samples, rho, correlation):
+    Z = rng.standard_normal((n_samples, width))
+
+    if correlation == "equi":
+        return state.common[:, None] + np.sqrt(1 - rho) * Z
+
+    # X_j = rho X_{j-1} + sqrt(1 - rho^2) Z_j along the columns
+    block, _ = lfilter(
+        [np.sqrt(1 - rho**2)],
+        [1, -rho],
+        Z,
+        axis=1,
+        zi=rho * state.previous[:, None],
+    )
+    state.previous = block[:, -1]
+
+    return block
+
+
+def _sparse_block(rng, state, start, width, n_samples, rho, correlation, density):
+    positions = _bernoulli_positions(rng, n_samples * width, density)
+    rows = positions % n_samples
+    columns = positions // n_samples
+    z = rng.standard_normal(len(positions))
+    indptr = np.searchsorted(columns, np.arange(width + 1))
+
+    if correlation == "equi":
+        data = state.common[rows] + np.sqrt(1 - rho) * z
+        return sp.csc_matrix((data, rows, indptr), shape=(n_samples, width))
+
+    # The AR(1) process observed only at the nonzeros: each value depends
+    # on the previous nonzero of its row, through rho to the power of the
+    # column gap. Nonzeros are processed by rank within their row, so each
+    # round is vectorized.
+    data = np.empty(len(positions))
+    order = np.lexsort((columns, rows))
+    sorted_rows = rows[order]
+    first = np.r_[True, sorted_rows[1:] != sorted_rows[:-1]]
+    group_start = np.maximum.accumulate(np.where(first, np.arange(len(order)), 0))
+    rank = np.arange(len(order)) - group_start
+
+    for r in range(rank.max() + 1 if len(rank) else 0):
+        idx = order[rank == r]
+        row = rows[idx]
+        column = start + columns[idx]
+        a = rho ** (column - state.last_column[row])
+        data[idx] = a * state.last_value[row] + np.sqrt(1 - a**2) * z[idx]
+        state.last_value[row] = data[idx]
+        state.last_column[row] = column
+
+    return sp.csc_matrix((data, rows, indptr), shape=(n_samples, width))
+
+
+def simulate_design(
+    n_samples: int,
+    n_features: int,
+    rho: float = 0.6,
+    X_density: float = 1.0,
+    correlation: str = "ar",
+    seed: int = 0,
+    chunk_size: int = 4096,
+):
+    """
+    Generate a correlated design matrix in chunks of columns.
+
+    Columns have unit variance and are either AR(1), with correlation
+    `rho^|i - j|` between columns i and j, or equicorrelated, with
+    correlation `rho`. Sparse designs (`X_density < 1`) keep each entry
+    with probability `X_density`, and the kept entries have the same joint
+    distribution as in the dense design. They are drawn directly as CSC
+    components, without a dense intermediate.
+
+    Every block of `BLOCK_SIZE` columns has its own random stream derived
+    from `seed`, so the output does not depend on `chunk_size`.
+
+    Parameters:
+    -----------
+    n_samples : int
+        Number of rows
+    n_features : int
+        Number of columns
+    rho : float
+        Correlation parameter
+    X_density : float
+        Expected fraction of nonzero entries, between 0 and 1. A density of
+        zero gives an all-zero sparse design.
+    correlation : str
+        "ar" or "equi"
+    seed : int
+        Random seed
+    chunk_size : int
+        Number of columns per chunk, rounded up to a multiple of
+        `BLOCK_SIZE`
+
+    Yields:
+    -------
+    tuple
+        The index of the first column of the chunk, and the chunk as a
+        numpy.ndarray or a scipy.sparse.csc_matrix
+    """
+    if correlation not in ("ar", "equi"):
+        raise ValueError(f"Unknown correlation structure: {correlation}")
+    if not 0 <= X_density <= 1:
+        raise ValueError(f"X_density must be between 0 and 1, got {X_density}")
+
+    sparse = X_density < 1
+    state = _DesignState(seed, n_samples, rho, correlation)
+    blocks_per_chunk = max(1, -(-chunk_size // BLOCK_SIZE))
+
+    chunk = []
+    chunk_start = 0
+    for block, start in enumerate(range(0, n_features, BLOCK_SIZE)):
+        width = min(BLOCK_SIZE, n_features - start)
+        rng = _rng(seed, 1, block)
+
+        if sparse:
+            chunk.append(
+                _sparse_block(
+                    rng, state, start, width, n_samples, rho, correlation, X_density
+                )
+            )
+        else:
+            chunk.append(_dense_block(rng, state, width, n_samples, rho, correlation))
+
+        if len(chunk) == blocks_per_chunk or start + width == n_features:
+            joined = sp.hstack(chunk, format="csc") if sparse else np.hstack(chunk)
+            yield chunk_start, joined
+            chunk_start = start + width
+            chunk = []
+
+
+def simulated_key(
+    n_samples: int,
+    n_features: int,
+    rho: float = 0.6,
+    X_density: float = 1.0,
+    n_signals: int = 20,
+    snr: float = 3.0,
+    correlation: str = "ar",
+    seed: int = 0,
+) -> str:
+    """Store key of a simulated dataset, in benchopt's parameter format."""
+    return (
+        f"Simulated[X_density={X_density},correlation={correlation},"
+        f"n_features={n_features},n_samples={n_samples},n_signals={n_signals},"
+        f"rho={rho},seed={seed},snr={snr}]"
+    )
+
+
+def simulate_dataset(
+    n_samples: int,
+    n_features: int,
+    rho: float = 0.6,
+    X_density: float = 1.0,
+    n_signals: int = 20,
+    snr: float = 3.0,
+    correlation: str = "ar",
+    seed: int = 0,
+    chunk_size: int = 4096,
+    store_dir=None,
+) -> Dataset:
+    """
+    Simulate a regression dataset directly into the dataset store.
+
+    The design is generated with `simulate_design`, one chunk at a time.
+    Dense chunks are written into a memory-mapped array in the store entry,
+    so memory use is bounded by the chunk size. The response is `X @ w`
+    plus Gaussian noise at signal-to-noise ratio `snr`, where `w` has
+    `n_signals` coefficients equal to one. It is accumulated over the
+    chunks. If the dataset is already in the store, it is loaded instead.
+
+    Returns:
+    --------
+    Dataset
+        The stored dataset, memory-mapped
+    """
+    key = simulated_key(
+        n_samples, n_features, rho, X_density, n_signals, snr, correlation, seed
+    )
+
+    try:
+        return load_dataset(key, store_dir, standardized=False)
+    except FileNotFoundError:
+        pass
+
+    rng = _rng(seed, 2)
+    support = rng.choice(n_features, size=min(n_signals, n_features), replace=False)
+    w = np.zeros(n_features)
+    w[support] = 1.0
+
+    sparse = X_density < 1
+    signal = np.zeros(n_samples)
+    col_norms = np.empty(n_features)
+    components = {"data": [], "indices": [], "indptr": [np.zeros(1, np.int64)]}
+
+    with dataset_entry(key, store_dir, standardized=False) as tmp_dir:
+        if not sparse:
+            X = np.lib.format.open_memmap(
+                tmp_dir / "X.npy",
+                mode="w+",
+                dtype=float,
+                shape=(n_samples, n_features),
+                fortran_order=True,
+            )
+
+        chunks = simulate_design(
+            n_samples, n_features, rho, X_density, correlation, seed, chunk_size
+        )
+        for start, chunk in chunks:
+            stop = start + chunk.shape[1]
+            signal += chunk @ w[start:stop]
+
+            if sparse:
+                col_norms[start:stop] = np.sqrt(
+                    np.asarray(chunk.multiply(chunk).sum(axis=0)).ravel()
+                )
+                components["data"].append(chunk.data)
+                components["indices"].append(chunk.indices)
+                components["indptr"].append(
+                    chunk.indptr[1:] + components["indptr"][-1][-1]
+                )
+            else:
+                col_norms[start:stop] = np.linalg.norm(chunk, axis=0)
+                X[:, start:stop] = chunk
+
+        if sparse:
+            for name, parts in components.items():
+                np.save(tmp_dir / f"{name}.npy", np.concatenate(parts))
+        else:
+            X.flush()
+            del X
+
+        noise = rng.standard_normal(n_samples)
+        scale = np.linalg.norm(signal) / (snr * np.linalg.norm(noise))
+        np.save(tmp_dir / "y.npy", signal + scale * noise)
+        np.save(tmp_dir / "center.npy", np.zeros(n_features))
+        np.save(tmp_dir / "scale.npy", np.ones(n_features))
+        np.save(tmp_dir / "col_norms.npy", col_norms)
+        write_metadata(tmp_dir, key, (n_samples, n_features), sparse, False)
+
+    return load_dataset(key, store_dir, standardized=False)
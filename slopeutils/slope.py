@@ -0,0 +1,186 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def dual_norm_slope(X, theta, alphas):
+    """Dual slope norm of X.T @ theta"""
+    Xtheta = np.sort(np.abs(X.T @ theta))[::-1]
+    taus = 1 / np.cumsum(alphas)
+    return np.max(np.cumsum(Xtheta) * taus)
+
+
+def _dual_norm_from_sorted(cumsums, taus, chunk_size):
+    """Max over k of cumsums[:, k] * taus[:, k] for all pairs of rows."""
+    m, k = cumsums.shape
+    out = np.empty((m, taus.shape[0]))
+    step = max(1, chunk_size // max(1, k * taus.shape[0]))
+
+    for start in range(0, m, step):
+        stop = min(start + step, m)
+        prod = cumsums[start:stop, None, :] * taus[None, :, :]
+        out[start:stop] = prod.max(axis=2)
+
+    return out
+
+
+def dual_norm_slope_batch(
+    X=None,
+    thetas=None,
+    alphas=None,
+    correlations=None,
+    k=64,
+    chunk_size=2**22,
+):
+    """
+    Dual SLOPE norm for many dual points and lambda sequences at once.
+
+    Computes `dual_norm_slope(X, theta, alpha)` for every column `theta` of
+    `thetas` and every row `alpha` of `alphas`. The correlations `X.T @
+    thetas` are computed with a single matrix product (or passed directly)
+    and the reciprocal cumulative lambda sums are computed once.
+
+    Only the `k` largest correlations of each dual point are sorted at
+    first. Because the lambdas are non-increasing, the ratio of cumulative
+    sums beyond position `k` is bounded by a ratio of linear functions of
+    the position, whose maximum is at one of the endpoints. Points where
+    that bound could exceed the current maximum are recomputed with a full
+    sort, so the result is exact.
+
+    Parameters:
+    -----------
+    X : array_like or scipy.sparse matrix, shape (n, p)
+        Design matrix. Not needed if `correlations` is given.
+    thetas : array_like, shape (n,) or (n, m)
+        Dual points
+    alphas : array_like, shape (p,) or (L, p)
+        Non-increasing, positive lambda sequences
+    correlations : array_like, shape (p,) or (p, m), optional
+        Precomputed `X.T @ thetas`
+    k : int
+        Number of leading correlations to sort at first
+    chunk_size : int
+        Maximum number of elements in intermediate arrays
+
+    Returns:
+    --------
+    numpy.ndarray, shape (m, L)
+        Dual norms, with one row per dual point and one column per lambda
+        sequence
+    """
+    if correlations is None:
+        correlations = X.T @ thetas
+
+    c = np.abs(np.asarray(correlations, dtype=float))
+    if c.ndim == 1:
+        c = c[:, None]
+    c = c.T  # (m, p)
+
+    alphas = np.atleast_2d(np.asarray(alphas, dtype=float))
+    lambda_sums = np.cumsum(alphas, axis=1)
+    taus = 1 / lambda_sums
+
+    _, p = c.shape
+    k = min(k, p)
+
+    if k == p:
+        cumsums = np.cumsum(-np.sort(-c, axis=1), axis=1)
+        return _dual_norm_from_sorted(cumsums, taus, chunk_size)
+
+    top = -np.partition(-c, k - 1, axis=1)[:, :k]
+    top = -np.sort(-top, axis=1)
+    cumsums = np.cumsum(top, axis=1)
+    out = _dual_norm_from_sorted(cumsums, taus[:, :k], chunk_size)
+
+    # Upper bound for positions k + 1, ..., p: each further correlation is at
+    # most the k-th largest and each further lambda at least the smallest.
+    s_k = cumsums[:, -1][:, None]
+    c_k = top[:, -1][:, None]
+    l_k = lambda_sums[:, k - 1][None, :]
+    l_min = alphas[:, -1][None, :]
+    bound = np.maximum(
+        (s_k + c_k) / (l_k + l_min),
+        (s_k + (p - k) * c_k) / (l_k + (p - k) * l_min),
+    )
+
+    redo = np.any(bound > out, axis=1)
+
+    if np.any(redo):
+        full = np.cumsum(-np.sort(-c[redo], axis=1), axis=1)
+        out[redo] = _dual_norm_from_sorted(full, taus, chunk_size)
+
+    return out
+
+
+@dataclass(frozen=True)
+class Clusters:
+    """
+    Clusters of equal magnitude in a coefficient vector.
+
+    Clusters are ordered by decreasing magnitude, and the coefficients of
+    each cluster are stored contiguously in a flat permutation in CSR style:
+    the members of cluster `k` are `indices[ptr[k]:ptr[k + 1]]`, in
+    increasing order, and its magnitude is `values[k]`. Coefficients equal
+    to zero form the last cluster.
+
+    Attributes:
+    -----------
+    indices : numpy.ndarray
+        Coefficient indices ordered by cluster
+    ptr : numpy.ndarray
+        Offsets of the clusters in `indices`, of length `n_clusters + 1`
+    values : numpy.ndarray
+        Magnitude of each cluster, decreasing
+    membership : numpy.ndarray
+        Cluster of each coefficient
+    """
+
+    indices: np.ndarray
+    ptr: np.ndarray
+    values: np.ndarray
+    membership: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.values)
+
+    @property
+    def starts(self) -> np.ndarray:
+        """Offset of the first coefficient of each cluster."""
+        return self.ptr[:-1]
+
+    @property
+    def ends(self) -> np.ndarray:
+        """Offset one past the last coefficient of each cluster."""
+        return self.ptr[1:]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.ptr)
+
+    def members(self, k: int) -> np.ndarray:
+        """Indices of the coefficients in cluster `k`."""
+        return self.indices[self.ptr[k] : self.ptr[k + 1]]
+
+    def cluster_of(self, j):
+        """Cluster holding coefficient (or coefficients) `j`."""
+        return self.membership[j]
+
+
+def get_clusters(w) -> Clusters:
+    """Find the clusters of `w`, in O(p log p) with a single argsort."""
+    magnitudes = np.abs(np.asarray(w))
+    indices = np.argsort(-magnitudes, kind="stable")
+    sorted_magnitudes = magnitudes[indices]
+
+    boundaries = np.flatnonzero(np.diff(sorted_magnitudes)) + 1
+    ptr = np.concatenate(([0], boundaries, [len(indices)]))
+    values = sorted_magnitudes[ptr[:-1]]
+
+    membership = np.empty(len(indices), dtype=np.intp)
+    membership[indices] = np.repeat(np.arange(len(values)), np.diff(ptr))
+
+    return Clusters(indices, ptr, values, membership)
@@ -0,0 +1,169 @@
+import numpy as np
+
+from .slope import Clusters
+
+
+def threshold_breakpoints(
+    clusters: Clusters, lambdas: np.ndarray, k: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Breakpoints of the SLOPE thresholding operator for cluster `k`.
+
+    For every other cluster `j`, the operator maps gamma to `c_j` on the
+    interval `[r_sums[j], l_sums[j]]`, where the bounds are `c_j` plus the
+    sum of the lambdas that cluster `k` would take at the lower or upper
+    end of cluster `j`. Between these intervals the operator is
+    `|gamma|` minus one of the lambda sums in `sums`.
+
+    Parameters:
+    -----------
+    clusters : Clusters
+        Clusters of the current coefficients, from `get_clusters`
+    lambdas : numpy.ndarray
+        Non-increasing lambda sequence
+    k : int
+        Cluster to threshold
+
+    Returns:
+    --------
+    tuple of numpy.ndarray
+        `l_sums` and `r_sums`, with one entry per cluster other than `k`,
+        and the unique lambda sums `sums` in decreasing order
+    """
+    l_sum, r_sum, c = _breakpoint_sums(clusters, lambdas, np.array([k]))
+    l_sums = l_sum[0] + c[0]
+    r_sums = r_sum[0] + c[0]
+    sums = np.unique(np.concatenate((l_sum[0], r_sum[0])))[::-1]
+
+    return l_sums, r_sums, sums
+
+
+def _breakpoint_sums(
+    clusters: Clusters, lambdas: np.ndarray, ks: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Lambda sums at the lower and upper end of every other cluster, and
+    # the values of these clusters, with one row per cluster of `ks`
+    lambdas = np.asarray(lambdas, dtype=float)
+    p = len(lambdas)
+    sizes = clusters.sizes[ks][:, None]
+
+    others = np.arange(len(clusters) - 1)[None, :]
+    others = others + (others >= ks[:, None])
+    mod = np.where(others > ks[:, None], sizes, 0)
+
+    # Sums over lambdas[a:a + size] through the cumulative sums, with the
+    # same clipping as slicing
+    cumsum = np.concatenate(([0.0], np.cumsum(lambdas)))
+    l_start = clusters.starts[others] - mod
+    r_start = clusters.ends[others] - mod
+    l_sum = cumsum[np.clip(l_start + sizes, 0, p)] - cumsum[np.clip(l_start, 0, p)]
+    r_sum = cumsum[np.clip(r_start + sizes, 0, p)] - cumsum[np.clip(r_start, 0, p)]
+
+    return l_sum, r_sum, clusters.values[others]
+
+
+def _searchsorted_rows(a: np.ndarray, v: np.ndarray, side: str) -> np.ndarray:
+    # np.searchsorted of `v` in every increasing row of `a`, in one call.
+    # Ranking all values first lets each row be offset past the previous
+    # one exactly, so that the rows form a single sorted array.
+    n_rows, n = a.shape
+    _, ranks = np.unique(np.concatenate((a.ravel(), v)), return_inverse=True)
+    offsets = np.arange(n_rows)[:, None] * (ranks.max(initial=0) + 1)
+
+    keys = (ranks[: a.size].reshape(a.shape) + offsets).ravel()
+    queries = ranks[a.size :][None, :] + offsets
+    positions = np.searchsorted(keys, queries, side=side)
+
+    return positions - np.arange(n_rows)[:, None] * n
+
+
+def _unique_rows(a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Unique values of every row in decreasing order, left aligned and
+    # padded with the smallest one, and their number per row
+    rows = np.arange(a.shape[0])[:, None]
+    values = -np.sort(-a, axis=1)
+    new = np.ones(values.shape, dtype=bool)
+    new[:, 1:] = values[:, 1:] != values[:, :-1]
+    rank = np.cumsum(new, axis=1) - 1
+
+    unique = np.repeat(values[:, -1:], a.shape[1], axis=1)
+    unique[rows, rank] = values
+
+    return unique, rank[:, -1] + 1
+
+
+def cluster_threshold(
+    gamma: np.ndarray, clusters: Clusters, lambdas: np.ndarray, k
+) -> np.ndarray:
+    """
+    Evaluate the SLOPE cluster thresholding operator T(gamma, omega; c, lambda).
+
+    The operator is evaluated for a whole array of gamma values at once by
+    locating each `|gamma|` among the breakpoints from
+    `threshold_breakpoints` with `np.searchsorted`, which takes
+    O((grid + clusters) log clusters) time. An array of clusters `k` is
+    broadcast along a leading axis, with the breakpoints of all clusters
+    located by a single `np.searchsorted` call.
+
+    Parameters:
+    -----------
+    gamma : array_like
+        Values to evaluate the operator at
+    clusters : Clusters
+        Clusters of the current coefficients, from `get_clusters`
+    lambdas : numpy.ndarray
+        Non-increasing lambda sequence
+    k : int or array_like of int
+        Cluster, or clusters, to threshold
+
+    Returns:
+    --------
+    numpy.ndarray
+        Operator values with the shape of `gamma`, or with an extra leading
+        axis over the clusters if `k` is an array
+    """
+    gamma = np.asarray(gamma, dtype=float)
+    ks = np.atleast_1d(np.asarray(k, dtype=np.intp))
+    abs_gamma = np.abs(gamma).ravel()
+    rows = np.arange(len(ks))[:, None]
+
+    lambdas = np.asarray(lambdas, dtype=float)
+    l_sum, r_sum, c = _breakpoint_sums(clusters, lambdas, ks)
+    l_sums = l_sum + c
+    r_sums = r_sum + c
+    sums, n_sums = _unique_rows(np.concatenate((l_sum, r_sum), axis=1))
+    n = l_sums.shape[1]
+
+    # Number of upper bounds at or above |gamma|, one row per cluster
+    n_above = _searchsorted_rows(-l_sums, -abs_gamma, side="right")
+
+    # With both bounds decreasing, the intervals containing |gamma| are
+    # those between the first lower bound below |gamma| and the last upper
+    # bound above it. Other clusters fall back to comparing with every
+    # interval.
+    first = n - _searchsorted_rows(r_sums[:, ::-1], abs_gamma, side="right")
+    inside = first < n_above
+
+    decreasing = np.all(np.diff(l_sums) < 0, axis=1) & np.all(
+        np.diff(r_sums) < 0, axis=1
+    )
+    if not np.all(decreasing):
+        in_interval = (abs_gamma[:, None] <= l_sums[:, None, :]) & (
+            abs_gamma[:, None] >= r_sums[:, None, :]
+        )
+        n_bounds = np.sum(abs_gamma[:, None] <= l_sums[:, None, :], axis=-1)
+        n_above = np.where(decreasing[:, None], n_above, n_bounds)
+        first = np.where(decreasing[:, None], first, np.argmax(in_interval, axis=-1))
+        inside = np.where(decreasing[:, None], inside, np.any(in_interval, axis=-1))
+
+    first = np.minimum(first, max(n - 1, 0))
+    slide = abs_gamma - sums[rows, np.minimum(n_above, n_sums[:, None] - 1)]
+    result = np.where(inside, c[rows, first] if n else 0.0, slide)
+    result = np.sign(gamma) * result.reshape(len(ks), *gamma.shape)
+
+    zero_sum = np.cumsum(lambdas[::-1])[clusters.sizes[ks] - 1]
+    zero_sum = zero_sum.reshape(-1, *(1,) * gamma.ndim)
+
+    result = np.where(np.abs(gamma) < zero_sum, 0.0, result)
+
+    return result if np.ndim(k) > 0 else result[0]
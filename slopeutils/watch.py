@@ -0,0 +1,373 @@
+import argparse
+import os
+import sys
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .cache import file_fingerprint
+from .facets import (
+    DECIMATE_DPI,
+    MARKER_SPACING,
+    MAX_MARKERS,
+    axes_buckets,
+    decimate,
+    facet_groups,
+    plot_facets,
+    trace_options,
+)
+from .merge_parquet import contains, find_parquet_files, read_parquet_file
+from .params import parse_params
+from .plot_utils import extract_reg_param, reg_labels, set_plot_defaults
+
+COLUMNS = [
+    "objective_name",
+    "data_name",
+    "solver_name",
+    "idx_rep",
+    "stop_val",
+    "time",
+    "objective_value",
+    "objective_duality_gap",
+]
+
+
+def prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the `reg` and `rel_gap` columns to the results of a file."""
+    df = extract_reg_param(df)
+
+    if "objective_duality_gap" in df and "objective_value" in df:
+        df["rel_gap"] = df["objective_duality_gap"] / df["objective_value"]
+
+    return df
+
+
+def short_name(name: str) -> str:
+    """A benchopt name with its parameter values only, e.g. `Simulated[0.6,200]`."""
+    base, params = parse_params(name)
+    if not params:
+        return base
+
+    return f"{base}[{','.join(str(value) for value in params.values())}]"
+
+
+class ResultsWatcher:
+    """
+    Read the result files of a directory as they appear or change.
+
+    Each call of `poll` only reads the files that are new or whose size or
+    modification time changed since the previous call. Files that cannot be
+    read yet, such as a parquet file whose footer is still being written,
+    are retried at the next poll.
+    """
+
+    def __init__(
+        self,
+        directory_path: str,
+        columns: list[str] | None = COLUMNS,
+        filters=None,
+        transform=prepare,
+    ):
+        self.directory_path = directory_path
+        self.columns = columns
+        self.filters = filters
+        self.transform = transform
+        self.seen = {}
+
+    def poll(self) -> dict[str, pd.DataFrame | None]:
+        """
+        Frames of the files that changed since the last poll.
+
+        Returns:
+        --------
+        dict
+            The rows of each new or rewritten file, keyed by path, and None
+            for the files that were removed
+        """
+        frames = {}
+        files = find_parquet_files(self.directory_path)
+
+        for path in files:
+            try:
+                fingerprint = file_fingerprint(path)
+            except OSError:
+                continue
+
+            if self.seen.get(path) == fingerprint:
+                continue
+
+            try:
+                table = read_parquet_file(path, self.columns, self.filters)
+            except (OSError, pa.ArrowException):
+                # Not completely written yet, retried at the next poll
+                table = None
+
+            if table is None:
+                continue
+
+            df = table.to_pandas()
+            if self.transform is not None:
+                df = self.transform(df)
+
+            self.seen[path] = fingerprint
+            frames[path] = df
+
+        for path in set(self.seen) - set(files):
+            del self.seen[path]
+            frames[path] = None
+
+        return frames
+
+
+class LiveFacets:
+    """
+    A `plot_facets` figure that is updated as results come in.
+
+    The `x` and `y` values of each line are kept as one piece per file.
+    When a file changes, only the lines it contributes to are recombined
+    from their pieces and updated in place with `set_data`. The figure is
+    only rebuilt when a new facet or curve appears.
+
+    Parameters:
+    -----------
+    row, col, hue : str
+        Columns defining the facet rows, facet columns and curves
+    x, y : str
+        Columns to plot against each other
+    **plot_kwargs
+        Passed on to `plot_facets`
+    """
+
+    def __init__(
+        self,
+        row: str = "data_name",
+        col: str = "reg",
+        hue: str = "solver_name",
+        x: str = "time",
+        y: str = "rel_gap",
+        **plot_kwargs,
+    ):
+        self.keys = [row, col, hue]
+        self.x = x
+        self.y = y
+        self.plot_kwargs = plot_kwargs
+
+        self.frames = {}
+        self.pieces = {}
+        self.fig = None
+        self.lines = {}
+
+    def update(self, frames: dict[str, pd.DataFrame | None]) -> set[tuple]:
+        """
+        Replace the rows of the given files and update the affected lines.
+
+        Returns:
+        --------
+        set of tuple
+            Keys `(row, col, hue)` of the lines that changed
+        """
+        dirty = set()
+
+        for path, df in frames.items():
+            self.frames.pop(path, None)
+            for key, pieces in self.pieces.items():
+                if pieces.pop(path, None) is not None:
+                    dirty.add(key)
+
+            if df is None or df.empty:
+                continue
+
+            self.frames[path] = df
+            sorted_df, groups = facet_groups(df, self.keys, sort_by=self.x)
+            x_values = sorted_df[self.x].to_numpy(dtype=float)
+            y_values = sorted_df[self.y].to_numpy(dtype=float)
+
+            for key, rows in groups.items():
+                self.pieces.setdefault(key, {})[path] = (
+                    x_values[rows],
+                    y_values[rows],
+                )
+                dirty.add(key)
+
+        if not dirty:
+            return dirty
+
+        if self.fig is None or any(
+            key not in self.lines and self.pieces.get(key) for key in dirty
+        ):
+            self._rebuild()
+        else:
+            for key in dirty:
+                self._set_line(key)
+
+        return dirty
+
+    def _line_data(self, key) -> tuple[np.ndarray, np.ndarray]:
+        pieces = list(self.pieces.get(key, {}).values())
+        if not pieces:
+            return np.empty(0), np.empty(0)
+
+        x_values = np.concatenate([piece[0] for piece in pieces])
+        y_values = np.concatenate([piece[1] for piece in pieces])
+        order = np.argsort(x_values, kind="stable")
+
+        return x_values[order], y_values[order]
+
+    def _set_line(self, key):
+        line = self.lines[key]
+        x_values, y_values = self._line_data(key)
+
+        if self.plot_kwargs.get("decimate_traces", True):
+            dpi = self.plot_kwargs.get("dpi", DECIMATE_DPI)
+            keep = decimate(x_values, y_values, axes_buckets(line.axes, dpi))
+            x_values, y_values = x_values[keep], y_values[keep]
+
+        options = trace_options(
+            len(x_values),
+            self.plot_kwargs.get("max_markers", MAX_MARKERS),
+            self.plot_kwargs.get("marker_spacing", MARKER_SPACING),
+            self.plot_kwargs.get("rasterize_above"),
+        )
+        line.set_data(x_values, y_values)
+        line.set_markevery(options["markevery"])
+        line.set_rasterized(options["rasterized"])
+        line.axes.relim()
+        line.axes.autoscale_view()
+
+    def _rebuild(self):
+        if self.fig is not None:
+            plt.close(self.fig)
+            self.fig, self.lines = None, {}
+
+        if not self.frames:
+            return
+
+        df = pd.concat(self.frames.values(), ignore_index=True)
+        row, col, hue = self.keys
+        self.fig, _, self.lines = plot_facets(
+            df, row, col, hue, self.x, self.y, **self.plot_kwargs
+        )
+
+    def save(self, path: str):
+        """Write the figure, replacing `path` only once it is complete."""
+        root, ext = os.path.splitext(path)
+        tmp = f"{root}.tmp{ext}"
+        self.fig.savefig(tmp, bbox_inches="tight", pad_inches=0.05)
+        os.replace(tmp, path)
+
+
+def watch(
+    directory_path: str,
+    output: str | None = None,
+    interval: float = 2.0,
+    redraw_interval: float = 10.0,
+    duration: float | None = None,
+    watcher: ResultsWatcher | None = None,
+    live: LiveFacets | None = None,
+):
+    """
+    Follow a results directory and keep a convergence figure up to date.
+
+    The directory is polled every `interval` seconds. The figure is redrawn
+    when lines changed, but at most once every `redraw_interval` seconds,
+    either in a window or, if `output` is given, to that file.
+
+    Parameters:
+    -----------
+    directory_path : str
+        Results directory, for instance the output of `slopeutils.benchrun`
+    output : str, optional
+        File to write the figure to instead of showing it
+    interval : float
+        Seconds between polls of the directory
+    redraw_interval : float
+        Minimum number of seconds between redraws
+    duration : float, optional
+        Stop after this many seconds. Runs until interrupted if None.
+    watcher : ResultsWatcher, optional
+        Reader of the directory, by default with the columns of the
+        single-penalty benchmark
+    live : LiveFacets, optional
+        Figure to update, by default one facet row per dataset and one
+        column per regularization strength
+    """
+    if watcher is None:
+        watcher = ResultsWatcher(directory_path)
+    if live is None:
+        live = LiveFacets(col_label=reg_labels, row_label=short_name)
+
+    start = time.monotonic()
+    last_draw = -np.inf
+    pending = False
+
+    while duration is None or time.monotonic() - start < duration:
+        frames = watcher.poll()
+
+        if frames:
+            changed = live.update(frames)
+            n_rows = sum(len(df) for df in frames.values() if df is not None)
+            print(
+                f"{time.strftime('%H:%M:%S')} {len(frames)} files changed, "
+                f"{n_rows} rows, {len(changed)} curves updated"
+            )
+            pending = pending or bool(changed)
+
+        if live.fig is None:
+            pending = False
+        elif pending and time.monotonic() - last_draw >= redraw_interval:
+            if output is not None:
+                live.save(output)
+            else:
+                live.fig.canvas.draw_idle()
+                plt.show(block=False)
+            last_draw = time.monotonic()
+            pending = False
+
+        if output is None and live.fig is not None:
+            plt.pause(interval)
+        else:
+            time.sleep(interval)
+
+    if pending and output is not None and live.fig is not None:
+        live.save(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Follow a benchopt results directory and plot it live."
+    )
+    parser.add_argument("results_dir", help="directory of parquet results")
+    parser.add_argument("-o", "--output", help="write the figure to this file")
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--redraw-interval", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=None)
+    parser.add_argument("--filter", help="regex the dataset names must match")
+    parser.add_argument("--y", default="rel_gap", help="column to plot")
+    args = parser.parse_args(argv)
+
+    set_plot_defaults(preview=True)
+
+    filters = contains("data_name", args.filter) if args.filter else None
+    columns = COLUMNS if args.y == "rel_gap" else [*COLUMNS, args.y]
+
+    try:
+        watch(
+            args.results_dir,
+            output=args.output,
+            interval=args.interval,
+            redraw_interval=args.redraw_interval,
+            duration=args.duration,
+            watcher=ResultsWatcher(args.results_dir, columns, filters),
+            live=LiveFacets(y=args.y, col_label=reg_labels, row_label=short_name),
+        )
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def drifted_results(tmp_path):
+    """Two result shards whose schemas drifted between benchopt versions."""
+    pq.write_table(
+        pa.table(
+            {
+                "solver_name": ["a", "a"],
+                "data_name": ["d", "d"],
+                "objective_name": ["o", "o"],
+                "idx_rep": pa.array([0, 0], pa.int64()),
+                "time": [1.0, 2.0],
+                "objective_value": [1.0, 1.0],
+                "objective_duality_gap": [1e-1, 1e-3],
+            }
+        ),
+        tmp_path / "run_0.parquet",
+    )
+    # A later run: `idx_rep` became a double and a column was added
+    pq.write_table(
+        pa.table(
+            {
+                "solver_name": ["b", "b"],
+                "data_name": ["d", "d"],
+                "objective_name": ["o", "o"],
+                "idx_rep": pa.array([1.0, 1.0]),
+                "time": [0.5, 1.5],
+                "objective_value": [2.0, 2.0],
+                "objective_duality_gap": [2e-2, 2e-7],
+                "objective_support_size": [3, 2],
+            }
+        ),
+        tmp_path / "run_1.parquet",
+    )
+
+    return str(tmp_path)
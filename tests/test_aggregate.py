@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+from slopeutils.aggregate import (
+    iter_result_batches,
+    repetition_bands,
+    time_to_tolerance,
+)
+
+
+def test_iter_result_batches_unifies_drifted_schemas(drifted_results):
+    batches = list(
+        iter_result_batches(
+            drifted_results, ["solver_name", "idx_rep", "objective_support_size"]
+        )
+    )
+    rows = sorted(
+        (row.solver_name, row.idx_rep, row.objective_support_size)
+        for batch in batches
+        for row in batch.itertuples()
+    )
+
+    assert [row[:2] for row in rows] == [("a", 0.0), ("a", 0.0), ("b", 1.0), ("b", 1.0)]
+    assert np.isnan(rows[0][2]) and {rows[2][2], rows[3][2]} == {2, 3}
+
+
+def test_time_to_tolerance_reads_drifted_schemas(drifted_results):
+    ttt = time_to_tolerance(drifted_results, tolerances=[1e-3])
+    times = dict(zip(ttt["solver_name"], ttt["time"]))
+
+    assert times == {"a": 2.0, "b": 1.5}
+
+
+def _repeated_traces(seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for solver, n_reps in (("a", 5), ("b", 4), ("c", 1)):
+        for rep in range(n_reps):
+            length = rng.integers(5, 30)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "solver_name": solver,
+                        "idx_rep": rep,
+                        "time": np.cumsum(rng.exponential(size=length)),
+                        "rel_gap": 10 ** np.sort(rng.uniform(-8, 0, length))[::-1],
+                    }
+                )
+            )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_repetition_bands_match_a_groupby_reference():
+    df = _repeated_traces()
+    n_grid, n_boot, level = 20, 4000, 0.8
+    bands = repetition_bands(
+        df, ["solver_name"], n_grid=n_grid, n_boot=n_boot, level=level
+    )
+    rng = np.random.default_rng(1)
+    agree = []
+
+    for solver, cell in df.groupby("solver_name"):
+        result = bands[bands["solver_name"] == solver]
+        grid = np.linspace(cell["time"].min(), cell["time"].max(), n_grid)
+        traces = np.array(
+            [
+                np.interp(grid, trace["time"], np.log10(trace["rel_gap"]))
+                for _, trace in cell.groupby("idx_rep")
+            ]
+        )
+
+        np.testing.assert_allclose(result["time"], grid)
+        np.testing.assert_allclose(result["rel_gap"], 10 ** np.median(traces, axis=0))
+        assert set(result["n_reps"]) == {len(traces)}
+
+        # A percentile bootstrap that resamples the repetitions directly
+        samples = traces[rng.integers(0, len(traces), (n_boot, len(traces)))]
+        medians = np.median(samples, axis=1)
+        for column, q in (("lower", 0.1), ("upper", 0.9)):
+            expected = 10 ** np.quantile(medians, q, axis=0, method="inverted_cdf")
+            agree.append(np.isclose(result[column], expected))
+
+        assert np.all(result["lower"] <= result["rel_gap"] * (1 + 1e-12))
+        assert np.all(result["rel_gap"] <= result["upper"] * (1 + 1e-12))
+        if len(traces) == 1:
+            np.testing.assert_allclose(result["lower"], result["rel_gap"])
+            np.testing.assert_allclose(result["upper"], result["rel_gap"])
+
+    # The bounds are order statistics, which both bootstraps mostly agree on
+    assert np.mean(agree) > 0.9
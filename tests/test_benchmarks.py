@@ -0,0 +1,42 @@
+import pyarrow as pa
+
+from slopeutils.benchmarks import _git_revision, compare, measure
+
+
+def test_measure_sees_arrow_allocations():
+    size = 64 * 2**20
+
+    # Filled in Arrow's memory pool, which tracemalloc does not trace
+    result = measure(lambda: pa.repeat(pa.scalar(1.0), size // 8), repeat=1)
+
+    assert result["peak_memory"] < size / 4
+    if result["peak_rss"] is not None:
+        assert result["peak_rss"] >= size * 0.9
+
+
+def test_compare_uses_the_rss_ratio_when_available():
+    def run(peak_memory, peak_rss):
+        return {
+            "results": [
+                {
+                    "benchmark": "load",
+                    "n_rows": 10,
+                    "n_files": 1,
+                    "time": 1.0,
+                    "peak_memory": peak_memory,
+                    "peak_rss": peak_rss,
+                }
+            ]
+        }
+
+    (row,) = compare(run(100, 1000), run(100, 3000))
+    assert row["memory_ratio"] == 3 and row["regression"]
+
+    (row,) = compare(run(100, None), run(100, 3000))
+    assert row["memory_ratio"] == 1 and not row["regression"]
+
+
+def test_git_revision_from_another_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    commit, _ = _git_revision()
+    assert commit != "unknown"
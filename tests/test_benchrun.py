@@ -0,0 +1,107 @@
+import os
+import subprocess
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from slopeutils import benchrun
+from slopeutils.benchrun import BenchCell, expand_config, run_cell, run_config
+
+CONFIG = """\
+objective:
+  - SLOPE
+dataset:
+  - simulated[n_samples=10]
+  - libsvm[dataset=rcv1.binary]
+solver:
+  - skglm
+n-repetitions: 3
+"""
+
+
+def write_config(tmp_path, text=CONFIG):
+    path = tmp_path / "config.yml"
+    path.write_text(text)
+    return str(path)
+
+
+def test_expand_config_repeats_every_combination(tmp_path):
+    cells = expand_config(write_config(tmp_path))
+
+    assert len(cells) == 6
+    assert {cell.dataset for cell in cells} == {
+        "simulated[n_samples=10]",
+        "libsvm[dataset=rcv1.binary]",
+    }
+    assert sorted(cell.repetition for cell in cells) == [0, 0, 1, 1, 2, 2]
+    assert len({cell.key for cell in cells}) == 6
+
+    # Every repetition has its own seed, which follows the base seed
+    assert (
+        len({cell.run_seed for cell in cells if cell.dataset == cells[0].dataset}) == 3
+    )
+    reseeded = expand_config(write_config(tmp_path, CONFIG + "seed: 7\n"))
+    assert {cell.run_seed for cell in reseeded}.isdisjoint(
+        {cell.run_seed for cell in cells}
+    )
+
+
+def test_run_cell_seeds_each_repetition(tmp_path, monkeypatch):
+    benchmark = tmp_path / "benchmark"
+    (benchmark / "outputs").mkdir(parents=True)
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    commands = []
+
+    def fake_run(command, **kwargs):
+        commands.append(command)
+        name = command[command.index("--output") + 1]
+        table = pa.table({"idx_rep": [0, 0], "objective_value": [1.0, 0.5]})
+        pq.write_table(table, benchmark / "outputs" / f"{name}.parquet")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    cells = [
+        BenchCell("SLOPE", "simulated", "skglm", repetition) for repetition in range(3)
+    ]
+    paths = [run_cell(cell, str(benchmark), str(results_dir)) for cell in cells]
+
+    seeds = [command[command.index("--seed") + 1] for command in commands]
+    assert seeds == [str(cell.run_seed) for cell in cells]
+    assert len(set(seeds)) == 3
+
+    for cell, path in zip(cells, paths):
+        assert pq.read_table(path)["idx_rep"].to_pylist() == [cell.repetition] * 2
+    assert os.listdir(benchmark / "outputs") == []
+
+
+def test_run_config_resumes_missing_cells(tmp_path, monkeypatch):
+    config_path = write_config(tmp_path)
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    cells = expand_config(config_path)
+    (results_dir / cells[0].shard_name).write_bytes(b"")
+    ran = []
+
+    def fake_run_cell(cell, benchmark, results_dir, timeout, extra_args):
+        ran.append(cell)
+        if cell == cells[1]:
+            raise subprocess.CalledProcessError(1, "benchopt", stderr="log\nboom\n")
+        path = os.path.join(results_dir, cell.shard_name)
+        open(path, "wb").close()
+        return path
+
+    monkeypatch.setattr(benchrun, "run_cell", fake_run_cell)
+
+    report = run_config(config_path, "benchmark", str(results_dir))
+    assert report.skipped == [cells[0]]
+    assert set(ran) == set(cells[1:])
+    assert report.errors == {cells[1]: "boom"}
+    assert set(report.done) == set(cells[2:])
+    assert not report.ok
+
+    # A second run only retries the failed cell
+    ran.clear()
+    report = run_config(config_path, "benchmark", str(results_dir))
+    assert ran == [cells[1]]
+    assert len(report.skipped) == 5
@@ -0,0 +1,66 @@
+import pyarrow as pa
+from pyarrow import feather
+
+from slopeutils import cache
+from slopeutils.cache import ResultsLoad, load_cached_results, warm_cache
+from slopeutils.merge_parquet import contains
+
+
+def test_entries_are_memory_mapped_without_copies(drifted_results, tmp_path):
+    cache_dir = tmp_path / "cache"
+    load_cached_results(drifted_results, cache_dir=cache_dir)
+
+    for entry in cache_dir.glob("*.arrow"):
+        before = pa.total_allocated_bytes()
+        table = feather.read_table(entry, memory_map=True)
+        assert table.num_rows == 2
+        assert pa.total_allocated_bytes() == before
+
+
+def test_library_changes_invalidate_entries(drifted_results, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    load_cached_results(drifted_results, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.arrow"))) == 2
+
+    load_cached_results(drifted_results, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.arrow"))) == 2
+
+    monkeypatch.setattr(cache, "_library_key", lambda: "changed")
+    df, report = load_cached_results(drifted_results, cache_dir=cache_dir)
+
+    assert report.ok and len(df) == 4
+    assert len(list(cache_dir.glob("*.arrow"))) == 4
+
+
+def test_warm_cache_reads_shared_files_once(drifted_results, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    columns = ("solver_name", "time", "objective_value")
+    loads = [
+        ResultsLoad(".", columns=columns, filters=contains("solver_name", "a")),
+        ResultsLoad(".", columns=columns[:2], filters=contains("solver_name", "b")),
+        # The filter needs a column that no load projects
+        ResultsLoad(".", columns=columns, filters=contains("data_name", "d")),
+    ]
+
+    reads = []
+    read_parquet_file = cache.read_parquet_file
+
+    def counted(path, columns=None, filters=None):
+        reads.append(path)
+        return read_parquet_file(path, columns, filters)
+
+    monkeypatch.setattr(cache, "read_parquet_file", counted)
+
+    assert warm_cache(loads, root=drifted_results, cache_dir=cache_dir) == 2
+    assert len(reads) == 4
+
+    # The loads find all their entries, with the rows of a direct read
+    reads.clear()
+    frames = [load(root=drifted_results, cache_dir=cache_dir)[0] for load in loads]
+    assert reads == []
+    assert warm_cache(loads, root=drifted_results, cache_dir=cache_dir) == 0
+
+    assert list(frames[0]["solver_name"]) == ["a", "a"]
+    assert list(frames[1].columns) == ["solver_name", "time"]
+    assert list(frames[1]["time"]) == [0.5, 1.5]
+    assert len(frames[2]) == 4
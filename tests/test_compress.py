@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from slopeutils.compress import compress_traces, trace_mask
+
+
+def _traces(seed=0, n_traces=6, length=400):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for k in range(n_traces):
+        # A noisy, mostly decreasing gap over twelve decades
+        log_gap = np.linspace(0, -12, length) + 0.3 * rng.standard_normal(length)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "solver_name": f"s{k % 3}",
+                    "data_name": "d",
+                    "objective_name": "o",
+                    "idx_rep": k // 3,
+                    "time": np.cumsum(rng.exponential(size=length)),
+                    "objective_duality_gap": 2.0 * 10**log_gap,
+                    "objective_value": 2.0,
+                }
+            )
+        )
+
+    # Shuffled, so that the mask has to follow the rows of `df`
+    return pd.concat(frames).sample(frac=1, random_state=seed, ignore_index=True)
+
+
+@pytest.mark.parametrize("tolerance", [0.05, 0.5])
+def test_kept_points_stay_within_tolerance(tolerance):
+    df = _traces()
+    mask = trace_mask(df, tolerance=tolerance)
+    assert 0 < mask.sum() < len(df)
+
+    for _, trace in df.assign(keep=mask).groupby(["solver_name", "idx_rep"]):
+        trace = trace.sort_values("time")
+        log_gap = np.log10(trace["objective_duality_gap"] / trace["objective_value"])
+        kept = trace["keep"].to_numpy()
+        assert kept[0] and kept[-1]
+
+        # The line through the kept points, on a log scale
+        drawn = np.interp(trace["time"], trace["time"][kept], log_gap[kept])
+        assert np.max(np.abs(drawn - log_gap)) < tolerance
+
+
+def test_envelope_is_monotone():
+    df = _traces()
+    compressed = compress_traces(df, envelope=True)
+    full = compress_traces(df)
+    assert len(compressed) < len(full)
+
+    for _, trace in compressed.groupby(["solver_name", "idx_rep"]):
+        gap = trace.sort_values("time")["objective_duality_gap"].to_numpy()
+        assert np.all(np.diff(gap[:-1]) < 0)
@@ -0,0 +1,85 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from slopeutils import cv
+from slopeutils.cv import cross_validate, cv_table
+from slopeutils.datasets import share_design
+
+sortedl1 = pytest.importorskip("sortedl1")
+
+
+@pytest.fixture
+def design():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((2000, 300))
+    y = X[:, :5] @ np.arange(1.0, 6.0) + rng.standard_normal(2000)
+    return X, y
+
+
+def _peak(f, *args, **kwargs) -> int:
+    tracemalloc.start()
+    try:
+        f(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_cross_validate_matches_serial_paths(design):
+    X, y = design
+    X, y = X[:200, :20], y[:200]
+    result = cross_validate(X, y, q=[0.1, 0.2], n_folds=4, path_length=5, max_workers=1)
+
+    assert isinstance(result, sortedl1.results.CvResults)
+    assert result.n_param_sets == 2
+    assert [params["q"] for params in result.params] == [0.1, 0.2]
+    assert result.scores[0].shape == (4, 5)
+    assert np.all(np.isfinite(result.scores))
+    assert result.best_score == np.min(result.means)
+
+    # Fold 1 for q = 0.2, fit serially on the rows in their original order
+    order = np.random.default_rng(0).permutation(200)
+    test = np.array_split(order, 4)[1]
+    train = np.setdiff1d(np.arange(200), test)
+    fit = sortedl1.Slope(q=0.2).path(X[train], y[train], alphas=result.alphas[1])
+    predictions = X[test] @ fit.coefs[:, 0, :] + np.ravel(fit.intercepts)
+    expected = np.mean((y[test, None] - predictions) ** 2, axis=0)
+    np.testing.assert_allclose(result.scores[1][1], expected, rtol=1e-3)
+
+    table = cv_table(result)
+    assert len(table) == 10 and set(table["n_folds"]) == {4}
+
+
+def test_cross_validate_plots(design):
+    plt = pytest.importorskip("matplotlib.pyplot")
+    X, y = design
+    result = cross_validate(
+        X[:100, :10], y[:100], q=[0.1, 0.2], n_folds=3, path_length=4, max_workers=1
+    )
+
+    fig, axes = result.plot()
+    assert len(axes) == 2
+    plt.close(fig)
+
+
+def test_folds_share_the_design(design, tmp_path):
+    X, y = design
+    n = len(y)
+    order = np.random.default_rng(0).permutation(n)
+    spec = share_design(X, y, tmp_path, rows=order)
+    assert spec["shape"] == [n, X.shape[1]]
+    cv._init_worker(spec)
+
+    # A fold in the middle, whose training rows wrap around the end
+    start, stop = n // 4, n // 2
+    alphas = np.geomspace(1.0, 0.5, 3)
+    params = sortedl1.Slope().get_params()
+    try:
+        peak = _peak(cv._fit_fold, 0, 0, start, stop, params, alphas)
+    finally:
+        cv._shared.clear()
+
+    # Only the training rows are copied, once
+    assert peak < 1.1 * X.nbytes * (n - (stop - start)) / n
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from slopeutils.datasets import (
+    cached_dataset,
+    dataset_dir,
+    dataset_entry,
+    load_dataset,
+    share_design,
+    write_metadata,
+)
+
+
+def test_cached_dataset_keeps_standardized_and_raw_apart(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(5.0, 3.0, size=(50, 4))
+    y = rng.standard_normal(50)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return X, y
+
+    standardized = cached_dataset("toy[n=50]", loader, store_dir=tmp_path)
+    raw = cached_dataset("toy[n=50]", loader, standardize_X=False, store_dir=tmp_path)
+
+    np.testing.assert_allclose(np.mean(standardized.X, axis=0), 0.0, atol=1e-12)
+    np.testing.assert_array_equal(raw.X, X)
+    assert len(calls) == 2
+
+    # Both versions are now served from the store
+    again = cached_dataset("toy[n=50]", loader, standardize_X=False, store_dir=tmp_path)
+    np.testing.assert_array_equal(again.X, X)
+    assert len(calls) == 2
+
+
+def test_concurrent_writers_keep_one_complete_entry(tmp_path):
+    X = np.arange(12.0).reshape(4, 3)
+    y = np.arange(4.0)
+
+    def write(offset):
+        with dataset_entry("toy[n=4]", tmp_path, standardized=False) as tmp_dir:
+            share_design(X + offset, y, tmp_dir)
+            write_metadata(tmp_dir, "toy[n=4]", X.shape, False, False)
+            np.save(tmp_dir / "center.npy", np.zeros(3))
+            np.save(tmp_dir / "scale.npy", np.ones(3))
+            np.save(tmp_dir / "col_norms.npy", np.ones(3))
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(write, range(16)))
+
+    dataset = load_dataset("toy[n=4]", tmp_path, standardized=False)
+    assert dataset.X.shape == X.shape
+    assert [p.name for p in tmp_path.iterdir()] == [
+        dataset_dir("toy[n=4]", tmp_path, False).name
+    ]
+
+
+def test_incomplete_entry_is_replaced(tmp_path):
+    directory = dataset_dir("toy[n=4]", tmp_path, standardized=False)
+    directory.mkdir(parents=True)
+    (directory / "X.npy").write_bytes(b"partial")
+
+    raw = cached_dataset(
+        "toy[n=4]",
+        lambda: (np.ones((4, 2)), np.zeros(4)),
+        standardize_X=False,
+        store_dir=tmp_path,
+    )
+
+    np.testing.assert_array_equal(raw.X, np.ones((4, 2)))
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from slopeutils.facets import decimate, facet_groups
+
+
+def test_facet_groups_match_mask_filtering():
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame(
+        {
+            "dataset": pd.Categorical(rng.choice(["a", "b", "c"], n)),
+            "reg": rng.choice([0.5, 0.1, np.nan], n),
+            "solver_name": rng.choice(["x", "y"], n),
+            "time": rng.permutation(n).astype(float),
+        }
+    )
+    keys = ["dataset", "reg", "solver_name"]
+
+    sorted_df, groups = facet_groups(df, keys)
+
+    expected = df.groupby(keys, observed=True, dropna=False).size()
+    assert len(groups) == len(expected)
+    assert sum(s.stop - s.start for s in groups.values()) == n
+
+    for (dataset, reg, solver), rows in groups.items():
+        mask = (
+            (df["dataset"] == dataset)
+            & ((df["reg"] == reg) | (np.isnan(reg) & df["reg"].isna()))
+            & (df["solver_name"] == solver)
+        )
+        group = sorted_df[rows]
+        np.testing.assert_array_equal(
+            group["time"], np.sort(df.loc[mask, "time"].to_numpy())
+        )
+        assert (group["solver_name"] == solver).all()
+
+    # A single key still gives tuple keys
+    _, groups = facet_groups(df, ["dataset"])
+    assert set(groups) == {("a",), ("b",), ("c",)}
+
+
+def test_decimate_keeps_the_extremes_of_every_column():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 10, 20_000))
+    y = np.exp(-x) * rng.lognormal(size=len(x))
+    n_buckets = 100
+
+    kept = decimate(x, y, n_buckets, x_range=(1, 9))
+    assert np.all(np.diff(kept) > 0)
+    assert kept[0] == 0 and kept[-1] == len(x) - 1
+
+    # Points left and right of the range fall in one column on either side
+    bucket = np.clip(np.floor((x - 1) / (8 / n_buckets)), -1, n_buckets)
+    for b in np.unique(bucket):
+        rows = np.flatnonzero(bucket == b)
+        in_column = kept[np.isin(kept, rows)]
+        assert len(in_column) <= 4
+        assert {rows[0], rows[-1]} <= set(in_column)
+        assert y[in_column].min() == y[rows].min()
+        assert y[in_column].max() == y[rows].max()
+
+    short = decimate(x[:400], y[:400], n_buckets)
+    np.testing.assert_array_equal(short, np.arange(400))
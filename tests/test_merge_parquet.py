@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from slopeutils import merge_parquet
+from slopeutils.merge_parquet import contains, load_results, table_to_pandas
+
+
+def test_load_results_pushes_projection_and_filter_down(drifted_results, monkeypatch):
+    calls = []
+    read_table = merge_parquet.pq.read_table
+
+    def spy(path, columns=None, filters=None, **kwargs):
+        calls.append((Path(path).name, columns, str(filters)))
+        return read_table(path, columns=columns, filters=filters, **kwargs)
+
+    monkeypatch.setattr(merge_parquet.pq, "read_table", spy)
+
+    columns = ["solver_name", "time", "objective_support_size"]
+    filters = contains("solver_name", "b|a")
+    df, report = load_results(drifted_results, columns=columns, filters=filters)
+
+    # The parquet reader only decodes the requested columns present in a file
+    assert sorted(calls, key=lambda call: call[0]) == [
+        ("run_0.parquet", ["solver_name", "time"], str(filters)),
+        ("run_1.parquet", columns, str(filters)),
+    ]
+    assert list(df.columns) == columns
+    assert df["objective_support_size"].isna().sum() == 2
+    assert report.ok and report.n_rows == 4
+
+    df, report = load_results(drifted_results, filters=contains("solver_name", "b"))
+    assert set(df["solver_name"]) == {"b"}
+    assert report.rows == {
+        str(Path(drifted_results) / "run_0.parquet"): 0,
+        str(Path(drifted_results) / "run_1.parquet"): 2,
+    }
+
+
+def test_load_results_reports_unreadable_files(drifted_results):
+    broken = Path(drifted_results) / "run_2.parquet"
+    broken.write_bytes(b"not a parquet file")
+
+    df, report = load_results(drifted_results)
+
+    assert len(df) == 4
+    assert not report.ok
+    assert list(report.errors) == [str(broken)]
+    assert report.errors[str(broken)].startswith("ArrowInvalid")
+    assert str(broken) not in report.rows
+
+    for path in Path(drifted_results).glob("run_[01].parquet"):
+        path.unlink()
+
+    df, report = load_results(drifted_results)
+    assert df is None and report.n_rows == 0 and len(report.errors) == 1
+
+
+def test_compact_table_keeps_nulls_and_lists_out_of_objects():
+    table = pa.table(
+        {
+            "solver_name": ["a", "a", "b", "b"],
+            "objective_value": [1.0, 0.1, 1.0, 0.1],
+            "time": [0.1, 0.2, 0.1, 0.2],
+            "version-cuda": pa.nulls(4),
+            "version-numpy": [["2.2.5", ""]] * 4,
+        }
+    )
+    df = table_to_pandas(table)
+
+    assert df["solver_name"].dtype == "category"
+    assert df["objective_value"].dtype == "float64"
+    assert df["time"].dtype == "float32"
+    assert df["version-cuda"].dtype == "category"
+    assert df["version-cuda"].isna().all()
+    assert isinstance(df["version-numpy"].dtype, pd.ArrowDtype)
+    assert df["version-numpy"][0] == ["2.2.5", ""]
+    assert not (df.dtypes == object).any()
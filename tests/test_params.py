@@ -0,0 +1,57 @@
+import pandas as pd
+
+from slopeutils.params import param_table, parse_param_column, parse_params
+
+
+def test_parse_params_types_values():
+    name, params = parse_params(
+        "Simulated[X_density=1e-3,n_samples=200,rho=0.5,standardize=True,"
+        "seed=None,cov=toeplitz,shape=[10, 20]]"
+    )
+
+    assert name == "Simulated"
+    assert params == {
+        "X_density": 1e-3,
+        "n_samples": 200,
+        "rho": 0.5,
+        "standardize": True,
+        "seed": None,
+        "cov": "toeplitz",
+        "shape": "[10, 20]",
+    }
+    assert type(params["n_samples"]) is int
+    assert type(params["X_density"]) is float
+    assert parse_params("  skglm  ") == ("skglm", {})
+    assert parse_params("PGD[-1=x,reg=-.5]")[1] == {"-1": "x", "reg": -0.5}
+
+
+def test_param_table_dtypes():
+    table = param_table(
+        [
+            "SLOPE[q=0.1,reg=0.5,fit_intercept=True,path_length=50,loss=quadratic]",
+            "SLOPE[q=0.2,reg=1,fit_intercept=False,loss=logistic]",
+            "SLOPE[q=0.1,reg=0.5,fit_intercept=True,path_length=50,loss=quadratic]",
+        ]
+    )
+
+    assert len(table) == 2
+    assert table["reg"].dtype == "float64"
+    assert table["fit_intercept"].dtype == "boolean"
+    assert table["path_length"].dtype == "Int64"
+    assert table["path_length"].isna().tolist() == [False, True]
+    assert table["loss"].dtype == "category"
+
+
+def test_parse_param_column_broadcasts_to_rows():
+    series = pd.Series(
+        ["SLOPE[reg=0.5]", None, "SLOPE[reg=0.1]", "SLOPE[reg=0.5]"],
+        index=[10, 11, 12, 13],
+    )
+    parsed = parse_param_column(series, ["reg"], prefix="objective_")
+
+    assert list(parsed.columns) == ["objective_reg"]
+    assert parsed.index.tolist() == [10, 11, 12, 13]
+    pd.testing.assert_series_equal(
+        parsed["objective_reg"],
+        pd.Series([0.5, None, 0.1, 0.5], index=series.index, name="objective_reg"),
+    )
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from slopeutils.path import lambda_sequence, slope_path
+
+
+def _objective(X, y, beta, lambdas, alpha):
+    n = len(y)
+    penalty = alpha * np.sum(lambdas * np.sort(np.abs(beta))[::-1])
+    return np.sum((y - X @ beta) ** 2) / (2 * n) + penalty
+
+
+@pytest.fixture
+def problem():
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((60, 120))
+    beta = np.zeros(120)
+    beta[:6] = [4.0, -4.0, 3.0, 3.0, -2.0, 1.0]
+    y = X @ beta + 0.5 * rng.standard_normal(60)
+    return X, y
+
+
+def test_screening_gives_the_same_path(problem):
+    X, y = problem
+    screened = slope_path(X, y, path_length=15, tol=1e-8)
+    full = slope_path(X, y, path_length=15, tol=1e-8, screening=False)
+
+    np.testing.assert_array_equal(screened.alphas, full.alphas)
+    assert np.all(full.n_violations == 0)
+    assert np.count_nonzero(screened.coefs[:, 0]) == 0
+
+    lambdas = lambda_sequence(X.shape[1])
+    for k, alpha in enumerate(screened.alphas):
+        objectives = [
+            _objective(X, y, path.coefs[:, k], lambdas, alpha)
+            for path in (screened, full)
+        ]
+        assert objectives[0] == pytest.approx(objectives[1], rel=1e-6)
+
+    np.testing.assert_allclose(screened.coefs, full.coefs, atol=1e-3)
+    np.testing.assert_array_equal(screened.n_clusters, full.n_clusters)
+
+
+def test_sparse_design_gives_the_same_path(problem):
+    X, y = problem
+    dense = slope_path(X, y, path_length=5)
+    sparse = slope_path(sp.csc_matrix(X), y, path_length=5)
+
+    np.testing.assert_allclose(sparse.coefs, dense.coefs, atol=1e-8)
+
+
+def test_max_iter_must_be_positive(problem):
+    X, y = problem
+    with pytest.raises(ValueError, match="max_iter"):
+        slope_path(X, y, max_iter=0)
@@ -0,0 +1,40 @@
+import ast
+import re
+from pathlib import Path
+
+import pytest
+from matplotlib.mathtext import MathTextParser
+
+from slopeutils.plot_utils import reg_labels
+
+SCRIPTS = sorted((Path(__file__).resolve().parents[1] / "code").glob("*.py"))
+
+
+def _tex_strings(path: Path) -> list[str]:
+    """String literals of a script that contain TeX commands or math."""
+    return [
+        node.value
+        for node in ast.walk(ast.parse(path.read_text()))
+        if isinstance(node, ast.Constant)
+        and isinstance(node.value, str)
+        and ("$" in node.value or re.search(r"\\[a-zA-Z(\[]", node.value))
+    ]
+
+
+def _check_mathtext(text: str):
+    # Without usetex, only $...$ is math: \( \) would be drawn verbatim
+    assert not re.search(r"\\[(\[]", text), text
+    assert text.count("$") % 2 == 0 and re.search(r"\$.+\$", text), text
+
+    MathTextParser("path").parse(text)
+
+
+@pytest.mark.parametrize("script", SCRIPTS, ids=lambda path: path.name)
+def test_script_labels_parse_as_mathtext(script):
+    for text in _tex_strings(script):
+        _check_mathtext(text)
+
+
+def test_reg_labels_parse_as_mathtext():
+    for reg in (1.0, 0.1, 0.01):
+        _check_mathtext(reg_labels(reg))
@@ -0,0 +1,44 @@
+import json
+
+import numpy as np
+import pytest
+
+from slopeutils import profiling
+
+
+def test_write_report_creates_parent_directories(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "_enabled", True)
+    monkeypatch.setattr(profiling, "_records", [])
+
+    with profiling.stage("load") as s:
+        s.rows = 3
+
+    path = tmp_path / "profile" / "nested" / "simul"
+    profiling.write_report(str(path))
+
+    report = json.loads(path.with_suffix(".json").read_text())
+    (record,) = report["stages"]
+    assert record["name"] == "load" and record["rows"] == 3
+    assert "process_peak_rss" in record
+    assert path.with_suffix(".folded").read_text().split()[0].endswith(";load")
+
+
+def test_stage_peak_rss_is_per_stage(monkeypatch):
+    if profiling.reset_peak_rss() is None:
+        pytest.skip("the peak resident set size cannot be reset here")
+
+    monkeypatch.setattr(profiling, "_enabled", True)
+    monkeypatch.setattr(profiling, "_records", [])
+    size = 200 * 2**20
+
+    with profiling.stage("outer"):
+        with profiling.stage("heavy"):
+            block = np.ones(size // 8)
+            del block
+        with profiling.stage("light"):
+            pass
+
+    peaks = {record["name"]: record["peak_rss"] for record in profiling._records}
+    assert peaks["heavy"] - peaks["light"] > size / 2
+    assert peaks["outer"] >= peaks["heavy"]
+    assert profiling.peak_rss() >= peaks["heavy"]
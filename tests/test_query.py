@@ -0,0 +1,26 @@
+from slopeutils.query import scan_results
+
+
+def test_scan_results_unifies_drifted_schemas(drifted_results):
+    df = (
+        scan_results(drifted_results)
+        .select(["solver_name", "idx_rep", "objective_support_size"])
+        .collect()
+        .sort_values("solver_name", kind="stable")
+    )
+
+    assert df["idx_rep"].tolist() == [0.0, 0.0, 1.0, 1.0]
+    assert df["objective_support_size"].isna().tolist() == [True, True, False, False]
+
+
+def test_scan_results_aggregates_across_drifted_schemas(drifted_results):
+    df = (
+        scan_results(drifted_results)
+        .group_by(["solver_name"])
+        .aggregate({"idx_rep": ["max"], "time": ["max"]})
+        .collect()
+        .set_index("solver_name")
+    )
+
+    assert df["idx_rep_max"].to_dict() == {"a": 0.0, "b": 1.0}
+    assert df["time_max"].to_dict() == {"a": 2.0, "b": 1.5}
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from slopeutils.simulate import simulate_design
+
+
+def _assemble(chunks, n_features):
+    starts, blocks = zip(*chunks)
+    widths = [block.shape[1] for block in blocks]
+    assert list(starts) == list(np.cumsum([0] + widths[:-1]))
+    assert sum(widths) == n_features
+    if sp.issparse(blocks[0]):
+        return sp.hstack(blocks, format="csc").toarray()
+    return np.hstack(blocks)
+
+
+@pytest.mark.parametrize("correlation", ["ar", "equi"])
+@pytest.mark.parametrize("X_density", [1.0, 0.1])
+def test_design_does_not_depend_on_chunk_size(correlation, X_density):
+    designs = [
+        _assemble(
+            simulate_design(
+                50,
+                600,
+                X_density=X_density,
+                correlation=correlation,
+                seed=3,
+                chunk_size=chunk_size,
+            ),
+            600,
+        )
+        for chunk_size in (1, 300, 10_000)
+    ]
+
+    for design in designs[1:]:
+        np.testing.assert_array_equal(design, designs[0])
+
+
+def test_ar_design_has_the_requested_correlation():
+    X = _assemble(simulate_design(20_000, 4, rho=0.6, seed=0), 4)
+
+    np.testing.assert_allclose(X.std(axis=0), 1.0, atol=0.03)
+    correlation = np.corrcoef(X, rowvar=False)
+    np.testing.assert_allclose(correlation[0], 0.6 ** np.arange(4), atol=0.03)
+
+
+def test_zero_density_gives_an_empty_design():
+    (start, X), *rest = simulate_design(10, 20, X_density=0.0)
+
+    assert start == 0 and not rest
+    assert sp.issparse(X) and X.shape == (10, 20) and X.nnz == 0
+
+    with pytest.raises(ValueError, match="X_density"):
+        next(simulate_design(10, 20, X_density=1.5))
@@ -0,0 +1,41 @@
+import numpy as np
+
+from slopeutils.slope import get_clusters
+
+
+def _baseline_clusters(w):
+    # The list-of-lists implementation get_clusters replaced
+    unique, indices, counts = np.unique(
+        np.abs(w), return_inverse=True, return_counts=True
+    )
+
+    clusters = [[] for _ in range(len(unique))]
+    for i in range(len(indices)):
+        clusters[indices[i]].append(i)
+    return clusters[::-1], counts[::-1], unique[::-1]
+
+
+def test_clusters_match_the_baseline():
+    rng = np.random.default_rng(0)
+
+    for _ in range(20):
+        p = rng.integers(1, 60)
+        w = rng.choice([-3.0, -1.5, 0.0, 0.5, 1.5, 2.0, 3.0], p)
+        members, counts, values = _baseline_clusters(w)
+        clusters = get_clusters(w)
+
+        assert clusters.n_clusters == len(clusters) == len(members)
+        np.testing.assert_array_equal(clusters.values, values)
+        np.testing.assert_array_equal(clusters.sizes, counts)
+        np.testing.assert_array_equal(clusters.ends - clusters.starts, counts)
+        for k, expected in enumerate(members):
+            np.testing.assert_array_equal(clusters.members(k), expected)
+            np.testing.assert_array_equal(clusters.cluster_of(expected), k)
+
+
+def test_zero_cluster_comes_last():
+    clusters = get_clusters(np.array([0.0, -2.0, 0.0, 2.0, 1.0]))
+
+    np.testing.assert_array_equal(clusters.values, [2.0, 1.0, 0.0])
+    np.testing.assert_array_equal(clusters.members(2), [0, 2])
+    np.testing.assert_array_equal(clusters.membership, [2, 0, 2, 0, 1])
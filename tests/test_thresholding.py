@@ -0,0 +1,33 @@
+import numpy as np
+
+from slopeutils.slope import get_clusters
+from slopeutils.thresholding import cluster_threshold
+
+
+def test_cluster_threshold_broadcasts_over_clusters():
+    rng = np.random.default_rng(0)
+    beta = np.array([3.0, -1.0, 3.0, 0.0, 2.0, -2.0, 0.5, 0.0])
+    lambdas = np.sort(rng.random(len(beta)))[::-1]
+    clusters = get_clusters(beta)
+    gamma = np.linspace(-6, 6, 121).reshape(11, 11)
+    ks = np.arange(len(clusters))
+
+    result = cluster_threshold(gamma, clusters, lambdas, ks)
+
+    assert result.shape == (len(ks), *gamma.shape)
+    for k in ks:
+        np.testing.assert_array_equal(
+            result[k], cluster_threshold(gamma, clusters, lambdas, int(k))
+        )
+
+
+def test_cluster_threshold_values():
+    clusters = get_clusters(np.array([2.0, 1.0]))
+    lambdas = np.array([1.0, 0.5])
+    gamma = np.array([-0.2, 0.6, 1.7, 3.0])
+
+    # Cluster 1 is zero below lambda_2, takes the value of cluster 0 on
+    # [2 + 0.5, 2 + 1] and slides by the matching lambda elsewhere
+    np.testing.assert_allclose(
+        cluster_threshold(gamma, clusters, lambdas, 1), [0.0, 0.1, 1.2, 2.0]
+    )
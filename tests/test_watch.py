@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from slopeutils.watch import ResultsWatcher
+
+
+def test_watcher_only_reads_new_and_changed_files(drifted_results):
+    directory = Path(drifted_results)
+    watcher = ResultsWatcher(
+        drifted_results, columns=["solver_name", "time"], transform=None
+    )
+
+    frames = watcher.poll()
+    assert sorted(Path(path).name for path in frames) == [
+        "run_0.parquet",
+        "run_1.parquet",
+    ]
+    assert all(list(df.columns) == ["solver_name", "time"] for df in frames.values())
+    assert watcher.poll() == {}
+
+    # A new shard, first caught while its footer is still being written
+    table = pa.table({"solver_name": ["c"], "time": [3.0]})
+    pq.write_table(table, directory / "run_2.parquet")
+    complete = (directory / "run_2.parquet").read_bytes()
+    (directory / "run_2.parquet").write_bytes(complete[:-8])
+    assert watcher.poll() == {}
+
+    (directory / "run_2.parquet").write_bytes(complete)
+    frames = watcher.poll()
+    assert list(frames) == [str(directory / "run_2.parquet")]
+    assert frames[str(directory / "run_2.parquet")]["solver_name"].tolist() == ["c"]
+
+    # A rewritten shard is read again, a removed one is reported as None
+    pq.write_table(
+        pa.table({"solver_name": ["a"], "time": [9.0]}), directory / "run_0.parquet"
+    )
+    stat = os.stat(directory / "run_0.parquet")
+    os.utime(directory / "run_0.parquet", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    os.remove(directory / "run_1.parquet")
+
+    frames = watcher.poll()
+    assert frames[str(directory / "run_0.parquet")]["time"].tolist() == [9.0]
+    assert frames[str(directory / "run_1.parquet")] is None
+    assert len(frames) == 2
+    assert watcher.poll() == {}